@@ -4,6 +4,7 @@ Safety module for input validation and security checks.
 
 from .input_validator import InputValidator, validate_company_input
 from .safety_guard import SafetyGuard, check_safety, ThreatType, SecurityCheck
+from .pipeline import validate_and_guard
 
 __all__ = [
     "InputValidator",
@@ -12,4 +13,5 @@ __all__ = [
     "check_safety",
     "ThreatType",
     "SecurityCheck",
+    "validate_and_guard",
 ]
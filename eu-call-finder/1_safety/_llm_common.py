@@ -0,0 +1,117 @@
+"""
+LLM helpers shared by the Input Validator and the Safety Guard: OpenAI
+clients, streamed JSON reading and caching of parsed LLM replies.
+"""
+
+import json
+import functools
+import hashlib
+import itertools
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from contracts.llm_cache import get_llm_cache
+from contracts.schemas import CompanyInput
+
+
+def read_json_stream(stream) -> str:
+    """
+    Read a streamed JSON-mode completion until it holds a complete JSON
+    object, then close the stream instead of waiting for the model to stop.
+    """
+    content = ""
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            content += delta
+            if "}" in delta and _is_complete_json(content):
+                break
+    finally:
+        stream.close()
+    return content
+
+
+async def read_json_stream_async(stream) -> str:
+    """Async variant of read_json_stream()."""
+    content = ""
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            content += delta
+            if "}" in delta and _is_complete_json(content):
+                break
+    finally:
+        await stream.close()
+    return content
+
+
+def _is_complete_json(content: str) -> bool:
+    """True if content parses as JSON."""
+    try:
+        json.loads(content)
+    except ValueError:
+        return False
+    return True
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield consecutive lists of at most `size` items."""
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def input_hash(input_data: CompanyInput, *extra: Any) -> str:
+    """
+    Stable content hash of the input (plus any settings that affect the result).
+    Callers pass their own name in extra, since they share one cache.
+    """
+    payload = json.dumps(
+        [input_data.model_dump(), *extra], sort_keys=True, default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """Return the parsed LLM reply cached for an input hash, or None."""
+    return get_llm_cache().get(f"llm:{key}")
+
+
+def cache_put(key: str, reply: Dict[str, Any]) -> None:
+    """
+    Store a parsed LLM reply (the JSON object) for an input hash. Replies are
+    plain JSON, so the cache can live in Redis and be shared across processes.
+    """
+    get_llm_cache().set(f"llm:{key}", reply)
+
+
+@functools.lru_cache(maxsize=8)
+def get_client(api_key: str, base_url: str):
+    """
+    Return a shared OpenAI client for the given credentials, so the
+    underlying connection pool is reused across calls.
+    """
+    import openai
+
+    return openai.OpenAI(api_key=api_key, base_url=base_url)
+
+
+def async_client(api_key: str, base_url: str):
+    """
+    Return a new AsyncOpenAI client, to be used as an async context manager
+    inside the calling coroutine:
+
+        async with async_client(api_key, base_url) as client:
+            ...
+
+    The client and its httpx connections are closed on exit. httpx
+    connections are bound to the event loop that opened them, and the
+    workflow starts a fresh loop per asyncio.run(), so a client kept past
+    its loop would only leak its sockets.
+    """
+    import openai
+
+    return openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
@@ -6,10 +6,47 @@ Uses manual OpenAI client (v1.0+).
 
 import os
 import json
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from contracts.schemas import CompanyInput, ValidationResult
 
+from ._llm_common import (
+    async_client,
+    cache_get,
+    cache_put,
+    chunked,
+    get_client,
+    input_hash,
+    read_json_stream,
+    read_json_stream_async,
+)
+
+# Shared parts of the single and batch validation prompts
+_VALIDATION_CRITERIA = """Your task:
+1. Evaluate if the company description is SPECIFIC enough to find relevant EU funding calls
+2. Check if it describes actual activities, technologies, and competencies (not just generic statements)
+3. Assess whether the description provides actionable information for matching with EU programs
+
+Scoring:
+- 0-3: Too vague/generic, cannot match with funding calls
+- 4-5: Somewhat specific but lacks detail
+- 6-7: Good level of detail, describes actual activities
+- 8-10: Excellent, highly specific with clear technologies and competencies"""
+
+_VALIDATION_STRICTNESS = "Be strict: Generic statements like 'we are a tech company' or 'we do software development' without specifics should score low."
+
+# Descriptions below these cannot score well with the LLM, so skip the call
+_MIN_LLM_DESCRIPTION_LENGTH = 60
+_MIN_DISTINCT_WORD_RATIO = 0.35
+
+# The distinct-word ratio of natural prose falls with length (about 0.4 at
+# 1500 words), so it only marks repetition in descriptions shorter than this
+_MAX_RATIO_CHECK_WORDS = 100
+
+# Companies per batched LLM call: smaller context models get fewer rows
+_BATCH_SIZE_SMALL_MODEL = 8
+_BATCH_SIZE = 16
+
 
 class InputValidator:
     """
@@ -46,6 +83,9 @@ class InputValidator:
 
         # Step 2: LLM Validation (only if API key is available)
         if self.openai_api_key:
+            too_weak = self._too_weak_for_llm(input_data)
+            if too_weak is not None:
+                return too_weak
             try:
                 llm_result = self._llm_validation(input_data)
                 return self._merge_results(basic_result, llm_result)
@@ -60,6 +100,84 @@ class InputValidator:
 
         return basic_result
 
+    async def validate_async(self, input_data: CompanyInput) -> ValidationResult:
+        """
+        Async variant of validate(). The LLM call goes through an
+        AsyncOpenAI client so it can run concurrently with other LLM calls.
+
+        Args:
+            input_data: The company input data to validate
+
+        Returns:
+            ValidationResult with validation status and feedback
+        """
+        basic_result = self._basic_validation(input_data)
+        if not basic_result.is_valid:
+            return basic_result
+
+        if self.openai_api_key:
+            too_weak = self._too_weak_for_llm(input_data)
+            if too_weak is not None:
+                return too_weak
+            try:
+                llm_result = await self._llm_validation_async(input_data)
+                return self._merge_results(basic_result, llm_result)
+            except Exception as e:
+                return ValidationResult(
+                    is_valid=basic_result.is_valid,
+                    score=basic_result.score,
+                    missing_fields=basic_result.missing_fields,
+                    reason=f"{basic_result.reason} (Note: LLM validation failed: {str(e)})",
+                )
+
+        return basic_result
+
+    def validate_many(self, inputs: List[CompanyInput]) -> List[ValidationResult]:
+        """
+        Validate several company inputs, batching the LLM step.
+
+        Inputs that pass basic validation are sent to the LLM in batches of
+        up to _batch_size() companies per request, one row per company.
+
+        Args:
+            inputs: The company inputs to validate
+
+        Returns:
+            One ValidationResult per input, in the same order
+        """
+        results = [self._basic_validation(input_data) for input_data in inputs]
+        if not self.openai_api_key:
+            return results
+
+        pending = []
+        for i, result in enumerate(results):
+            if not result.is_valid:
+                continue
+            too_weak = self._too_weak_for_llm(inputs[i])
+            if too_weak is not None:
+                results[i] = too_weak
+            else:
+                pending.append(i)
+
+        for batch in chunked(pending, self._batch_size()):
+            try:
+                llm_results = self._llm_validation_batch([inputs[i] for i in batch])
+            except Exception as e:
+                for i in batch:
+                    basic_result = results[i]
+                    results[i] = ValidationResult(
+                        is_valid=basic_result.is_valid,
+                        score=basic_result.score,
+                        missing_fields=basic_result.missing_fields,
+                        reason=f"{basic_result.reason} (Note: LLM validation failed: {str(e)})",
+                    )
+                continue
+
+            for i, llm_result in zip(batch, llm_results):
+                results[i] = self._merge_results(results[i], llm_result)
+
+        return results
+
     def _basic_validation(self, input_data: CompanyInput) -> ValidationResult:
         """
         Perform basic structural validation.
@@ -89,6 +207,10 @@ class InputValidator:
         if not input_data.company.type:
             missing_fields.append("company.type")
 
+        # Without these there is nothing to match against, so skip the rest
+        if missing_fields:
+            return self._missing_fields_result(missing_fields)
+
         # Check employees
         if input_data.company.employees < 1:
             missing_fields.append("company.employees")
@@ -110,12 +232,7 @@ class InputValidator:
         # They are optional and will be inferred by the Planner
 
         if missing_fields:
-            return ValidationResult(
-                is_valid=False,
-                score=0.0,
-                missing_fields=missing_fields,
-                reason=f"Missing required fields: {', '.join(missing_fields)}",
-            )
+            return self._missing_fields_result(missing_fields)
 
         # Calculate basic score based on description quality
         score = 5.0  # Base score for passing basic validation
@@ -143,6 +260,44 @@ class InputValidator:
             reason="Basic validation passed. Semantic analysis will provide detailed assessment.",
         )
 
+    def _too_weak_for_llm(self, input_data: CompanyInput) -> Optional[ValidationResult]:
+        """
+        Cheap pre-LLM gate: descriptions that are very short, or short and
+        mostly repeated words, cannot reach a passing LLM score, so reject
+        them without the API call.
+
+        Args:
+            input_data: Input that passed basic validation
+
+        Returns:
+            Failed ValidationResult, or None if the LLM should be consulted
+        """
+        description = input_data.company.description.strip()
+        words = description.lower().split()
+
+        if len(description) >= _MIN_LLM_DESCRIPTION_LENGTH and (
+            len(words) >= _MAX_RATIO_CHECK_WORDS
+            or len(set(words)) / len(words) >= _MIN_DISTINCT_WORD_RATIO
+        ):
+            return None
+
+        return ValidationResult(
+            is_valid=False,
+            score=3.0,
+            missing_fields=["company.description"],
+            reason="Description too short or repetitive for LLM analysis. "
+            "Describe your activities, technologies and competencies in more detail.",
+        )
+
+    def _missing_fields_result(self, missing_fields: List[str]) -> ValidationResult:
+        """Failed basic validation result listing the missing fields."""
+        return ValidationResult(
+            is_valid=False,
+            score=0.0,
+            missing_fields=missing_fields,
+            reason=f"Missing required fields: {', '.join(missing_fields)}",
+        )
+
     def _llm_validation(self, input_data: CompanyInput) -> ValidationResult:
         """
         Perform semantic validation using OpenAI LLM.
@@ -153,31 +308,136 @@ class InputValidator:
         Returns:
             LLM-based validation result
         """
-        prompt = self._create_validation_prompt(input_data)
+        cache_key = input_hash(input_data, "validate", self.model)
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return self._result_from_data(cached)
 
         # Call OpenAI API using v1.0+ syntax
-        import openai
+        client = get_client(self.openai_api_key, self.openai_base_url)
 
-        client = openai.OpenAI(
-            api_key=self.openai_api_key, base_url=self.openai_base_url
-        )
-
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert validator for EU funding applications. Analyze company descriptions for specificity and relevance to EU funding calls.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            messages=self._build_llm_messages(input_data),
             temperature=0.3,
             max_tokens=500,
+            response_format={"type": "json_object"},
+            stream=True,
         )
+        content = read_json_stream(stream)
 
         # Parse the response
-        content = response.choices[0].message.content
-        return self._parse_llm_response(content)
+        return self._parse_llm_response(content, cache_key)
+
+    async def _llm_validation_async(self, input_data: CompanyInput) -> ValidationResult:
+        """
+        Perform semantic validation using an AsyncOpenAI client.
+
+        Args:
+            input_data: The input data to validate
+
+        Returns:
+            LLM-based validation result
+        """
+        cache_key = input_hash(input_data, "validate", self.model)
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return self._result_from_data(cached)
+
+        async with async_client(self.openai_api_key, self.openai_base_url) as client:
+            stream = await client.chat.completions.create(
+                model=self.model,
+                messages=self._build_llm_messages(input_data),
+                temperature=0.3,
+                max_tokens=500,
+                response_format={"type": "json_object"},
+                stream=True,
+            )
+            content = await read_json_stream_async(stream)
+
+        return self._parse_llm_response(content, cache_key)
+
+    def _llm_validation_batch(
+        self, inputs: List[CompanyInput]
+    ) -> List[ValidationResult]:
+        """
+        Validate a batch of inputs with a single LLM call.
+        Cached inputs are answered from the cache and left out of the prompt.
+
+        Args:
+            inputs: The input data to validate
+
+        Returns:
+            LLM-based validation results, in input order
+        """
+        cache_keys = [
+            input_hash(input_data, "validate", self.model) for input_data in inputs
+        ]
+        results = [
+            None if cached is None else self._result_from_data(cached)
+            for cached in map(cache_get, cache_keys)
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        client = get_client(self.openai_api_key, self.openai_base_url)
+
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=self._build_batch_llm_messages([inputs[i] for i in missing]),
+            temperature=0.3,
+            max_tokens=500 * len(missing),
+            response_format={"type": "json_object"},
+            stream=True,
+        )
+        content = read_json_stream(stream)
+
+        parsed = self._parse_batch_llm_response(
+            content, [cache_keys[i] for i in missing]
+        )
+        for i, result in zip(missing, parsed):
+            results[i] = result
+        return results
+
+    def _batch_size(self) -> int:
+        """Number of companies to send per batched LLM call."""
+        if "gpt-3.5" in self.model:
+            return _BATCH_SIZE_SMALL_MODEL
+        return _BATCH_SIZE
+
+    def _build_llm_messages(self, input_data: CompanyInput) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for LLM validation.
+
+        Args:
+            input_data: The input data to validate
+
+        Returns:
+            System and user messages
+        """
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert validator for EU funding applications. Analyze company descriptions for specificity and relevance to EU funding calls. Always respond with a single JSON object.",
+            },
+            {"role": "user", "content": self._create_validation_prompt(input_data)},
+        ]
+
+    def _build_batch_llm_messages(
+        self, inputs: List[CompanyInput]
+    ) -> List[Dict[str, str]]:
+        """Chat messages for the batched validation call."""
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert validator for EU funding applications. Analyze company descriptions and determine if they are specific enough to match with EU funding calls. Always respond with a single JSON object.",
+            },
+            {
+                "role": "user",
+                "content": self._create_batch_validation_prompt(inputs),
+            },
+        ]
 
     def _create_validation_prompt(self, input_data: CompanyInput) -> str:
         """
@@ -189,6 +449,74 @@ class InputValidator:
         Returns:
             Formatted prompt string
         """
+        prompt = f"""Analyze this company description for EU funding suitability.
+
+{self._format_company(input_data)}
+
+{_VALIDATION_CRITERIA}
+
+Return ONLY a JSON object with this structure:
+{{
+    "is_valid": true/false,
+    "score": 0-10,
+    "missing_fields": ["list what information is missing or too vague"],
+    "reason": "explanation of the score and specific recommendations"
+}}
+
+{_VALIDATION_STRICTNESS}"""
+
+        return prompt
+
+    def _create_batch_validation_prompt(self, inputs: List[CompanyInput]) -> str:
+        """
+        Create one prompt that validates several companies, one row each.
+
+        Args:
+            inputs: The input data to validate, in row order (row_id starts at 1)
+
+        Returns:
+            Formatted prompt string
+        """
+        rows = "\n\n".join(
+            f"=== ROW {row_id} ===\n{self._format_company(input_data)}"
+            for row_id, input_data in enumerate(inputs, 1)
+        )
+
+        prompt = f"""Analyze each of the following {len(inputs)} company descriptions for EU funding suitability.
+
+{rows}
+
+{_VALIDATION_CRITERIA}
+
+Apply the task and scoring to EACH row independently.
+
+Return ONLY a JSON object with this structure, with exactly one entry per row_id:
+{{
+    "results": [
+        {{
+            "row_id": 1,
+            "is_valid": true/false,
+            "score": 0-10,
+            "missing_fields": ["list what information is missing or too vague"],
+            "reason": "explanation of the score and specific recommendations"
+        }}
+    ]
+}}
+
+{_VALIDATION_STRICTNESS}"""
+
+        return prompt
+
+    def _format_company(self, input_data: CompanyInput) -> str:
+        """
+        Format the company profile section of the validation prompt.
+
+        Args:
+            input_data: The input data to validate
+
+        Returns:
+            Company information, description and domains
+        """
         domains_str = "\n".join(
             [
                 f"  - {d.name} (level: {d.level.value})"
@@ -197,9 +525,7 @@ class InputValidator:
             ]
         )
 
-        prompt = f"""Analyze this company description for EU funding suitability.
-
-Company Information:
+        return f"""Company Information:
 - Name: {input_data.company.name}
 - Type: {input_data.company.type}
 - Employees: {input_data.company.employees}
@@ -210,67 +536,96 @@ Description:
 {input_data.company.description}
 
 Domains of Expertise:
-{domains_str}
+{domains_str}"""
 
-Your task:
-1. Evaluate if the company description is SPECIFIC enough to find relevant EU funding calls
-2. Check if it describes actual activities, technologies, and competencies (not just generic statements)
-3. Assess whether the description provides actionable information for matching with EU programs
+    def _parse_llm_response(self, response: str, cache_key: str) -> ValidationResult:
+        """
+        Parse LLM response into ValidationResult.
+        Only parsed results are cached, so an unusable reply is retried on
+        the next submission instead of being served from the cache.
 
-Scoring:
-- 0-3: Too vague/generic, cannot match with funding calls
-- 4-5: Somewhat specific but lacks detail
-- 6-7: Good level of detail, describes actual activities
-- 8-10: Excellent, highly specific with clear technologies and competencies
+        Args:
+            response: The LLM response string
+            cache_key: Cache key of the validated input
 
-Return ONLY a JSON object with this structure:
-{{
-    "is_valid": true/false,
-    "score": 0-10,
-    "missing_fields": ["list what information is missing or too vague"],
-    "reason": "explanation of the score and specific recommendations"
-}}
+        Returns:
+            Parsed validation result
+        """
+        try:
+            data = json.loads(response)
+            result = self._result_from_data(data)
 
-Be strict: Generic statements like 'we are a tech company' or 'we do software development' without specifics should score low."""
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            # JSON mode guarantees valid JSON unless the reply was truncated
+            return self._fallback_result(f"Could not parse LLM response: {str(e)}")
 
-        return prompt
+        cache_put(cache_key, data)
+        return result
 
-    def _parse_llm_response(self, response: str) -> ValidationResult:
+    def _parse_batch_llm_response(
+        self, response: str, cache_keys: List[str]
+    ) -> List[ValidationResult]:
         """
-        Parse LLM response into ValidationResult.
+        Parse a batched LLM response, routing each entry by its row_id.
+        Only rows that parsed are cached, as in _parse_llm_response().
 
         Args:
             response: The LLM response string
+            cache_keys: Cache keys of the rows that were sent, in row order
 
         Returns:
-            Parsed validation result
+            One validation result per row; rows the LLM skipped get the fallback
         """
+        count = len(cache_keys)
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                json_str = response.split("```")[1].strip()
-            else:
-                json_str = response.strip()
-
-            data = json.loads(json_str)
+            data = json.loads(response)
+            rows = data.get("results", []) if isinstance(data, dict) else data
+        except (json.JSONDecodeError, ValueError) as e:
+            return [
+                self._fallback_result(f"Could not parse LLM response: {str(e)}")
+            ] * count
+
+        by_row = {}
+        for row in rows:
+            try:
+                by_row[int(row["row_id"])] = row
+            except (KeyError, ValueError, TypeError):
+                continue
+
+        results = []
+        for row_id in range(1, count + 1):
+            row = by_row.get(row_id)
+            if row is None:
+                results.append(self._fallback_result("No LLM result for this company"))
+                continue
+            try:
+                result = self._result_from_data(row)
+            except (KeyError, ValueError, TypeError) as e:
+                results.append(
+                    self._fallback_result(f"Could not parse LLM response: {str(e)}")
+                )
+                continue
+            cache_put(cache_keys[row_id - 1], row)
+            results.append(result)
+        return results
 
-            return ValidationResult(
-                is_valid=data.get("is_valid", True),
-                score=float(data.get("score", 5.0)),
-                missing_fields=data.get("missing_fields", []),
-                reason=data.get("reason", "LLM validation completed"),
-            )
+    def _result_from_data(self, data: Dict[str, Any]) -> ValidationResult:
+        """Build a ValidationResult from one parsed LLM JSON object."""
+        return ValidationResult(
+            is_valid=data.get("is_valid", True),
+            score=float(data.get("score", 5.0)),
+            missing_fields=data.get("missing_fields", []),
+            reason=data.get("reason", "LLM validation completed"),
+        )
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            # If parsing fails, return a default result
-            return ValidationResult(
-                is_valid=True,
-                score=5.0,
-                missing_fields=[],
-                reason=f"Could not parse LLM response: {str(e)}. Using fallback validation.",
-            )
+    def _fallback_result(self, message: str) -> ValidationResult:
+        """Neutral result used when the LLM output cannot be used."""
+        return ValidationResult(
+            is_valid=True,
+            score=5.0,
+            missing_fields=[],
+            reason=f"{message}. Using fallback validation.",
+        )
 
     def _merge_results(
         self, basic: ValidationResult, llm: ValidationResult
@@ -0,0 +1,36 @@
+"""
+Combined safety + validation entry point for EU Call Finder.
+Runs the Input Validator and Safety Guard LLM checks concurrently.
+"""
+
+import asyncio
+from typing import Tuple
+
+from contracts.schemas import CompanyInput, ValidationResult
+
+from .input_validator import InputValidator
+from .safety_guard import SafetyGuard
+
+
+async def validate_and_guard(
+    input_data: CompanyInput, openai_api_key: str = None
+) -> Tuple[ValidationResult, ValidationResult]:
+    """
+    Validate the input and check it for security threats concurrently.
+    Both LLM calls are network-bound, so overlapping them roughly halves
+    the wall-clock time compared to running them back to back.
+
+    Args:
+        input_data: The company input to check
+        openai_api_key: Optional OpenAI API key
+
+    Returns:
+        Tuple of (validation result, safety result)
+    """
+    validator = InputValidator(openai_api_key=openai_api_key)
+    guard = SafetyGuard(openai_api_key=openai_api_key)
+
+    validation_result, safety_result = await asyncio.gather(
+        validator.validate_async(input_data), guard.check_async(input_data)
+    )
+    return validation_result, safety_result
@@ -4,286 +4,399 @@ Coordinates Safety Guard → Planner → Retrieval → Analysis → [Planner (lo
 """
 
 import os
+import re
 import sys
-from typing import Dict, Any, Literal
+import json
+import pickle
+import hashlib
+import asyncio
+import threading
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, Literal, NamedTuple, Optional
 from datetime import datetime
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Project root (parent of the numbered module folders)
+_PKG_ROOT = Path(__file__).resolve().parent.parent
 
-# langgraph >=1.0 removed/renamed some checkpoint symbols that older versions
-# expected (e.g., CheckpointAt). To keep the project working across langgraph
-# versions, we patch in a lightweight alias if missing.
 try:
-    import langgraph.checkpoint.base as _lg_cp_base
-
-    if not hasattr(_lg_cp_base, "CheckpointAt") and hasattr(_lg_cp_base, "Checkpoint"):
-        _lg_cp_base.CheckpointAt = _lg_cp_base.Checkpoint  # type: ignore[attr-defined]
-except Exception:
-    # If langgraph isn't importable yet, let the normal import error surface later.
-    pass
+    import orjson
+except ImportError:  # Optional: faster report serialization
+    orjson = None
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+# Add parent directory to path
+sys.path.insert(0, str(_PKG_ROOT))
 
 # Import state
 from contracts.state import WorkflowState, create_initial_state
+from contracts.plan_cache import get_plan_cache
+
+# Import implemented modules using importlib: the numbered folders are
+# packages, but their names are not valid identifiers for an import statement
+import importlib
+
+# Pipeline functions and classes, imported from their numbered folders on
+# first use so that importing this module stays cheap.
+# name -> module
+_LAZY_ATTRS = {
+    "SafetyGuard": "1_safety.safety_guard",
+    "InputValidator": "1_safety.input_validator",
+    "SmartPlanner": "3_planning.smart_planner",
+    "create_smart_plan": "3_planning.smart_planner",
+    "scrape_topics_node": "4_retrieval.scraper_manager",
+    "score_call": "5_analysis.scorer",
+    "precompute_profile": "5_analysis.scorer",
+    "apply_eligibility_filters": "5_analysis.eligibility",
+    "perform_qualitative_analysis": "5_analysis.llm_critic",
+    "perform_qualitative_analysis_batch": "5_analysis.llm_critic",
+    "perform_rule_based_analysis": "5_analysis.llm_critic",
+    "reflect_on_results": "5_analysis.reflection",
+    "generate_comprehensive_report": "6_reporter.reporter",
+}
+
+
+# name -> resolved function or class, filled in by _lazy
+_resolved: Dict[str, Any] = {}
+
+
+def _lazy(name: str):
+    """Return a pipeline function or class, loading its module on first use."""
+    value = _resolved.get(name)
+    if value is None:
+        module = importlib.import_module(_LAZY_ATTRS[name])
+        value = _resolved[name] = getattr(module, name)
+    return value
+
+
+def __getattr__(name: str):
+    """Keep master_agent.SafetyGuard etc. available as module attributes."""
+    if name in _LAZY_ATTRS:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _import_langgraph():
+    """Import langgraph on first use; it is the heaviest dependency here."""
+    # langgraph >=1.0 removed/renamed some checkpoint symbols that older versions
+    # expected (e.g., CheckpointAt). To keep the project working across langgraph
+    # versions, we patch in a lightweight alias if missing.
+    try:
+        import langgraph.checkpoint.base as _lg_cp_base
+
+        if not hasattr(_lg_cp_base, "CheckpointAt") and hasattr(
+            _lg_cp_base, "Checkpoint"
+        ):
+            _lg_cp_base.CheckpointAt = _lg_cp_base.Checkpoint  # type: ignore[attr-defined]
+    except Exception:
+        # If langgraph isn't importable yet, let the normal import error surface later.
+        pass
 
-# Import implemented modules using importlib (for numbered folders)
-import importlib.util
+    import langgraph.graph
 
+    return langgraph.graph
 
-def _load_module(module_name: str, file_path: str):
-    """Load a module from file path."""
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
 
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
 
-# Load Safety Guard
-_safety_module = _load_module(
-    "safety",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "1_safety", "safety_guard.py"
-    ),
-)
-_validator_module = _load_module(
-    "validator",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "1_safety", "input_validator.py"
-    ),
-)
-SafetyGuard = _safety_module.SafetyGuard
-InputValidator = _validator_module.InputValidator
-
-# Load Smart Planner
-_smart_planner_module = _load_module(
-    "smart_planner",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "3_planning", "smart_planner.py"
-    ),
-)
-SmartPlanner = _smart_planner_module.SmartPlanner
-create_smart_plan = _smart_planner_module.create_smart_plan
-
-# Load Retrieval
-_retrieval_module = _load_module(
-    "scraper",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "4_retrieval", "scraper_manager.py"
-    ),
-)
-scrape_topics_node = _retrieval_module.scrape_topics_node
+# The graph's terminal node name (langgraph.graph.END)
+END = "__end__"
 
-# Load Analysis Modules
-_analysis_scorer = _load_module(
-    "scorer",
-    os.path.join(os.path.dirname(os.path.dirname(__file__)), "5_analysis", "scorer.py"),
-)
-score_call = _analysis_scorer.score_call
 
-_analysis_eligibility = _load_module(
-    "eligibility",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "5_analysis", "eligibility.py"
-    ),
-)
-apply_eligibility_filters = _analysis_eligibility.apply_eligibility_filters
+# ==================== NODE IMPLEMENTATIONS ====================
+
+
+_SEPARATOR = "=" * 70
 
-_analysis_critic = _load_module(
-    "llm_critic",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "5_analysis", "llm_critic.py"
-    ),
+# Worker threads for blocking node work (checks, scraper runs), shared by all
+# runs. A sync node runs its own event loop per call, so the loop's default
+# executor would be created and torn down every time.
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AGENT_WORKERS", "32")),
+    thread_name_prefix="eu-call-finder",
 )
-perform_qualitative_analysis = _analysis_critic.perform_qualitative_analysis
 
-_analysis_reflection = _load_module(
-    "reflection",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "5_analysis", "reflection.py"
-    ),
+
+async def _to_thread(func, *args):
+    """Like asyncio.to_thread, but runs func on the shared executor."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args)
+    return await loop.run_in_executor(_executor, call)
+
+# Read-only stand-in for missing nested topic sections
+_EMPTY = MappingProxyType({})
+
+# Scorer fields copied into each analyzed call's score_breakdown
+_SCORE_BREAKDOWN_FIELDS = (
+    "domain_match",
+    "keyword_match",
+    "eligibility_fit",
+    "budget_feasibility",
+    "strategic_value",
+    "deadline_comfort",
 )
-reflect_on_results = _analysis_reflection.reflect_on_results
-
-# Load Reporter Module
-_reporter_module = _load_module(
-    "reporter",
-    os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "6_reporter", "reporter.py"
-    ),
+_score_breakdown = itemgetter(*_SCORE_BREAKDOWN_FIELDS)
+
+
+def _quiet() -> bool:
+    """Whether QUIET=true silences step results and per-topic details."""
+    return os.getenv("QUIET", "false").lower() == "true"
+
+
+def _print_header(title: str) -> None:
+    """Print a section header as a single write (api/routes.py watches for these)."""
+    print(f"\n{_SEPARATOR}\n{title}\n{_SEPARATOR}")
+
+
+def _report_json(report: Dict[str, Any]) -> bytes:
+    """Serialize a report to indented UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            report,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+    return json.dumps(report, indent=2, ensure_ascii=False, default=str).encode(
+        "utf-8"
+    )
+
+
+def _plan_hash(search_terms: list, search_query: Dict[str, Any]) -> str:
+    """Fingerprint of what a plan scrapes, used to spot a repeated plan."""
+    payload = json.dumps(
+        [sorted(search_terms), search_query], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _plan_repeated(state: WorkflowState) -> bool:
+    """Whether the planner's latest plan scrapes the same as the previous one."""
+    last_plan_hash = state.get("last_plan_hash")
+    return last_plan_hash is not None and last_plan_hash == state.get("prev_plan_hash")
+
+
+class _CheckResult(NamedTuple):
+    """Result of the basic dict-input checks, or of a cached check."""
+
+    is_valid: bool
+    score: float
+    reason: str
+    missing_fields: tuple = ()
+
+
+def _result_fields(result: Any) -> Dict[str, Any]:
+    """Plain-dict copy of a safety/validation result, for caching."""
+    return {
+        "is_valid": result.is_valid,
+        "score": result.score,
+        "reason": result.reason,
+        "missing_fields": list(getattr(result, "missing_fields", [])),
+    }
+
+
+# Injection markers rejected by the dict-input safety check
+_SUSPICIOUS_PATTERNS = (
+    r"<script",
+    r"javascript:",
+    r"on\w+\s*=",
+    r"ignore\s+previous",
+    r"override\s+instructions",
+    r"system\s*prompt:",
+    r"jailbreak",
+    r"DAN\s+mode",
 )
-generate_comprehensive_report = _reporter_module.generate_comprehensive_report
+_SUSPICIOUS_RE = re.compile("|".join(_SUSPICIOUS_PATTERNS), re.IGNORECASE)
+
+
+def _check_input_safety(company_input: Any) -> Any:
+    """Run the safety check on a company input dict or CompanyInput object."""
+    # Check if company_input is dict or CompanyInput object
+    if not isinstance(company_input, dict):
+        # Use regex-only mode to avoid LLM delays
+        guard = _lazy("SafetyGuard")(use_llm=False)
+        return guard.check(company_input)
+
+    # For dict input, extract text manually for safety check
+    text_parts = []
+    company = company_input.get("company", {})
+    text_parts.append(company.get("name", ""))
+    text_parts.append(company.get("description", ""))
+    text_parts.append(company.get("country", ""))
+    text_parts.append(company.get("city", ""))
+    for domain in company.get("domains", []):
+        text_parts.append(domain.get("name", ""))
+        text_parts.extend(domain.get("sub_domains", []))
+
+    # Filter out None values and convert to string
+    text_parts = [str(part) for part in text_parts if part is not None]
+    text = " ".join(text_parts).lower()
+
+    # Simple regex-based safety check on text. Clean input (the usual case)
+    # takes one pass of the combined pattern; only a hit is narrowed down
+    # to the individual patterns for the reason message.
+    threats_found = []
+    if _SUSPICIOUS_RE.search(text):
+        threats_found = [
+            pattern
+            for pattern in _SUSPICIOUS_PATTERNS
+            if re.search(pattern, text, re.IGNORECASE)
+        ]
+
+    if threats_found:
+        return _CheckResult(
+            False, 0.0, f"Security threats detected: {threats_found}"
+        )
 
+    return _CheckResult(True, 10.0, "Basic safety check passed")
 
-# ==================== NODE IMPLEMENTATIONS ====================
 
+def _validate_input(company_input: Any) -> Any:
+    """Run input validation on a company input dict or CompanyInput object."""
+    if not isinstance(company_input, dict):
+        # It's a CompanyInput object - run full validation. The validator
+        # caches its parsed LLM replies itself (see contracts.llm_cache).
+        validator = _lazy("InputValidator")()
+        return validator.validate(company_input)
 
-def safety_check_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
-    """Validate company input and check for safety or eligibility issues."""
-    print("\n" + "=" * 70)
-    print("STEP 1: SAFETY CHECK & VALIDATION")
-    print("=" * 70)
+    # For dict input, create a basic validation result
+    company = company_input.get("company", {})
+    has_name = bool(company.get("name"))
+    has_description = len(company.get("description", "")) >= 20
+    has_domains = len(company.get("domains", [])) > 0
 
-    company_input = state.get("company_input")
-    if not company_input:
+    validation_passed = has_name and has_description and has_domains
+    validation_score = 7.0 if validation_passed else 5.0
+
+    return _CheckResult(
+        validation_passed,
+        validation_score,
+        "Basic validation passed" if validation_passed else "Missing required fields",
+    )
+
+
+def _company_dict(company_input: Any) -> Dict[str, Any]:
+    """
+    Company input as a plain dict. A CompanyInput model is dumped once here;
+    after validation the dict replaces it in state, so later nodes never
+    convert it again.
+    """
+    if isinstance(company_input, dict):
+        return company_input
+    return company_input.model_dump()
+
+
+def _safety_failed(state: WorkflowState, safety_result: Any) -> Dict[str, Any]:
+    return {
+        "safety_check_passed": False,
+        "validation_errors": [safety_result.reason],
+        "workflow_status": "failed",
+        "error_message": f"Safety check failed: {safety_result.reason}",
+        "current_step": "failed",
+    }
+
+
+def _validation_outcome(
+    state: WorkflowState, validation_result: Any, company_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    if not validation_result.is_valid:
         return {
-            **state,
             "safety_check_passed": False,
+            "validation_result": _result_fields(validation_result),
+            "validation_errors": [validation_result.reason],
             "workflow_status": "failed",
-            "error_message": "No company input provided",
+            "error_message": f"Validation failed: {validation_result.reason}",
             "current_step": "failed",
         }
 
-    # Run safety guard
-    try:
-        guard = SafetyGuard(use_llm=False)  # Use regex-only mode to avoid LLM delays
-
-        # Check if company_input is dict or CompanyInput object
-        if isinstance(company_input, dict):
-            # For dict input, extract text manually for safety check
-            text_parts = []
-            company = company_input.get("company", {})
-            text_parts.append(company.get("name", ""))
-            text_parts.append(company.get("description", ""))
-            text_parts.append(company.get("country", ""))
-            text_parts.append(company.get("city", ""))
-            for domain in company.get("domains", []):
-                text_parts.append(domain.get("name", ""))
-                text_parts.extend(domain.get("sub_domains", []))
-
-            # Simple regex-based safety check on text
-            import re
-
-            # Filter out None values and convert to string
-            text_parts = [str(part) for part in text_parts if part is not None]
-            text = " ".join(text_parts).lower()
-
-            # Check for suspicious patterns
-            suspicious_patterns = [
-                r"<script",
-                r"javascript:",
-                r"on\w+\s*=",
-                r"ignore\s+previous",
-                r"override\s+instructions",
-                r"system\s*prompt:",
-                r"jailbreak",
-                r"DAN\s+mode",
-            ]
-
-            threats_found = []
-            for pattern in suspicious_patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    threats_found.append(pattern)
-
-            if threats_found:
-                print(f"[FAIL] Safety check failed: Suspicious patterns detected")
-                return {
-                    **state,
-                    "safety_check_passed": False,
-                    "validation_errors": [
-                        f"Security threats detected: {threats_found}"
-                    ],
-                    "workflow_status": "failed",
-                    "error_message": "Safety check failed: Security threats detected",
-                    "current_step": "failed",
-                }
+    return {
+        "company_input": company_dict,
+        "safety_check_passed": True,
+        "validation_result": _result_fields(validation_result),
+        "current_step": "planning",
+        "workflow_status": "running",
+    }
 
-            safety_result = type(
-                "obj",
-                (object,),
-                {
-                    "is_valid": True,
-                    "score": 10.0,
-                    "reason": "Basic safety check passed",
-                },
-            )()
-        else:
-            # It's a CompanyInput object
-            safety_result = guard.check(company_input)
 
-        if not safety_result.is_valid:
-            print(f"[FAIL] Safety check failed: {safety_result.reason}")
-            return {
-                **state,
-                "safety_check_passed": False,
-                "validation_errors": [safety_result.reason],
-                "workflow_status": "failed",
-                "error_message": f"Safety check failed: {safety_result.reason}",
-                "current_step": "failed",
-            }
+def _safety_error(state: WorkflowState, error: Exception) -> Dict[str, Any]:
+    return {
+        "safety_check_passed": False,
+        "validation_errors": [str(error)],
+        "workflow_status": "failed",
+        "error_message": f"Safety check error: {str(error)}",
+        "current_step": "failed",
+    }
 
-        print("[OK] Safety check passed")
+
+def _no_company_input(state: WorkflowState) -> Dict[str, Any]:
+    return {
+        "safety_check_passed": False,
+        "workflow_status": "failed",
+        "error_message": "No company input provided",
+        "current_step": "failed",
+    }
+
+
+def safety_check_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """Validate company input and check for safety or eligibility issues."""
+    _print_header("STEP 1: SAFETY CHECK & VALIDATION")
+
+    company_input = state.get("company_input")
+    if not company_input:
+        return _no_company_input(state)
+
+    try:
+        company_dict = _company_dict(company_input)
+
+        # Run safety guard
+        safety_result = _check_input_safety(company_input)
+        if not safety_result.is_valid:
+            return _safety_failed(state, safety_result)
 
         # Run input validation
-        if isinstance(company_input, dict):
-            # For dict input, create a basic validation result
-            company = company_input.get("company", {})
-            has_name = bool(company.get("name"))
-            has_description = len(company.get("description", "")) >= 20
-            has_domains = len(company.get("domains", [])) > 0
-
-            validation_passed = has_name and has_description and has_domains
-            validation_score = 7.0 if validation_passed else 5.0
-
-            validation_result = type(
-                "obj",
-                (object,),
-                {
-                    "is_valid": validation_passed,
-                    "score": validation_score,
-                    "reason": "Basic validation passed"
-                    if validation_passed
-                    else "Missing required fields",
-                    "missing_fields": [],
-                },
-            )()
-        else:
-            # It's a CompanyInput object - run full validation
-            validator = InputValidator()
-            validation_result = validator.validate(company_input)
-
-        if not validation_result.is_valid:
-            print(f"[FAIL] Validation failed: {validation_result.reason}")
-            return {
-                **state,
-                "safety_check_passed": False,
-                "validation_result": validation_result.__dict__,
-                "validation_errors": [validation_result.reason],
-                "workflow_status": "failed",
-                "error_message": f"Validation failed: {validation_result.reason}",
-                "current_step": "failed",
-            }
+        validation_result = _validate_input(company_input)
+        return _validation_outcome(state, validation_result, company_dict)
 
-        print(f"[OK] Input validation passed (score: {validation_result.score}/10)")
+    except Exception as e:
+        return _safety_error(state, e)
 
-        return {
-            **state,
-            "safety_check_passed": True,
-            "validation_result": validation_result.__dict__,
-            "current_step": "planning",
-            "workflow_status": "running",
-        }
+
+async def safety_check_node_async(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """
+    Async variant of safety_check_node, used when the graph runs through the
+    async API. The safety check and input validation are independent, so
+    they run concurrently in worker threads.
+    """
+    _print_header("STEP 1: SAFETY CHECK & VALIDATION")
+
+    company_input = state.get("company_input")
+    if not company_input:
+        return _no_company_input(state)
+
+    try:
+        company_dict = _company_dict(company_input)
+
+        safety_result, validation_result = await asyncio.gather(
+            _to_thread(_check_input_safety, company_input),
+            _to_thread(_validate_input, company_input),
+        )
+        if not safety_result.is_valid:
+            return _safety_failed(state, safety_result)
+
+        return _validation_outcome(state, validation_result, company_dict)
 
     except Exception as e:
-        print(f"[FAIL] Safety check error: {str(e)}")
-        return {
-            **state,
-            "safety_check_passed": False,
-            "validation_errors": [str(e)],
-            "workflow_status": "failed",
-            "error_message": f"Safety check error: {str(e)}",
-            "current_step": "failed",
-        }
+        return _safety_error(state, e)
 
 
 def planner_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
     """Analyze company profile and generate search query."""
 
-    print("\n" + "=" * 70)
-    print(f"STEP 2: PLANNING (Iteration {state.get('planner_iterations', 0) + 1})")
-    print("=" * 70)
+    planner_iterations = state.get("planner_iterations", 0)
+    _print_header(f"STEP 2: PLANNING (Iteration {planner_iterations + 1})")
 
     # Extract abort_event from LangGraph config if present
     config = kwargs.get("config", {})
@@ -301,7 +414,6 @@ def planner_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
     try:
         # Use Smart Planner for better analysis
         print("\n[ANALYSIS] Deep analyzing company profile...")
-        planner = SmartPlanner()
 
         # Ensure company_input is dict format
         if not isinstance(company_input, dict):
@@ -312,289 +424,423 @@ def planner_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
             print(f"\n[REFINEMENT] Using feedback from previous iteration:")
             print(f"   {plan_feedback[:100]}...")
 
-        plan = create_smart_plan(company_input, previous_feedback=plan_feedback)
-
-        # Display analysis results
-        analysis = plan.get("analysis", {})
-        print(f"\n[ANALYSIS RESULTS]:")
-        print(
-            f"   Technologies Detected: {', '.join(analysis.get('technologies', []))}"
-        )
-        print(f"   Applications: {', '.join(analysis.get('applications', []))}")
-        print(f"   Focus Areas: {', '.join(analysis.get('focus_areas', [])[:3])}")
-        print(f"   Target EU Programs: {', '.join(plan.get('target_programs', []))}")
-
-        print(f"\n[OK] Smart Plan Created:")
-        print(f"   Company: {plan['company_name']}")
-        print(f"   Search Queries ({len(plan['search_queries'])}):")
-        for i, query in enumerate(plan["search_queries"], 1):
-            print(f"      {i}. {query}")
-        print(f"   Target Programs: {', '.join(plan['target_programs'])}")
-        print(f"   Estimated Calls: {plan['estimated_calls']}")
-        print(f"   Reasoning: {plan['reasoning']}")
+        # Refinement iterations always re-plan; a first plan can come from cache
+        plan_cache = None if plan_feedback else get_plan_cache()
+        plan = plan_cache.get(company_input) if plan_cache else None
+        if plan is not None:
+            print("\n[CACHE] Reusing cached plan for this company profile")
+        else:
+            plan = _lazy("create_smart_plan")(
+                company_input, previous_feedback=plan_feedback
+            )
+            # A rule-based fallback plan (e.g. during an LLM outage) is not kept
+            if plan_cache and plan.get("llm_generated"):
+                plan_cache.put(company_input, plan)
 
         # Extract search terms and query from plan
         search_terms = plan["search_queries"]
         search_query = plan["filter_config"]
 
         return {
-            **state,
             "scraper_plan": plan,
             "search_terms": search_terms,
             "search_query": search_query,
-            "planner_iterations": state.get("planner_iterations", 0) + 1,
+            "prev_plan_hash": state.get("last_plan_hash"),
+            "last_plan_hash": _plan_hash(search_terms, search_query),
+            "planner_iterations": planner_iterations + 1,
             "current_step": "retrieval",
             "workflow_status": "running",
         }
 
     except Exception as e:
-        print(f"[FAIL] Planning error: {str(e)}")
         import traceback
 
         traceback.print_exc()
         return {
-            **state,
             "workflow_status": "failed",
             "error_message": f"Planning error: {str(e)}",
             "current_step": "failed",
         }
 
-        print(f"\n[OK] Plan created:")
-        print(f"   Company: {plan['company_name']}")
-        print(f"   Search queries: {len(plan['search_queries'])}")
-        for i, query in enumerate(plan["search_queries"], 1):
-            print(f"      {i}. {query}")
-        print(f"   Target programs: {', '.join(plan['target_programs'])}")
-        print(f"   Estimated calls: {plan['estimated_calls']}")
 
-        # Extract search terms and query from plan
-        search_terms = plan["search_queries"]
-        search_query = plan["filter_config"]
+async def _scrape_search_terms(scraper_state: Dict[str, Any]) -> list:
+    """
+    Scrape the topics found by the search terms, off the event loop.
 
-        return {
-            **state,
-            "scraper_plan": plan,
-            "search_terms": search_terms,
-            "search_query": search_query,
-            "planner_iterations": state.get("planner_iterations", 0) + 1,
-            "current_step": "retrieval",
-            "workflow_status": "running",
-        }
+    The scraper searches all terms concurrently and scrapes each unique
+    topic once, on a small pool of browsers (SCRAPER_CONCURRENCY).
+    """
+    result = await _to_thread(_lazy("scrape_topics_node"), scraper_state)
+    return result.get("scraped_topics", [])
+
+
+def _retrieval_state(state: WorkflowState) -> Dict[str, Any]:
+    # Prepare state for scraper node
+    # Note: `max_topics=2` was a temporary test limit. Keeping it in production
+    # can easily lead to misleading empty/too-small result sets.
+    scraper_state = {
+        "search_terms": state.get("search_terms", []),
+        "search_query": state.get("search_query", {}),
+        "headless": True,  # Run headless in production
+        # Allow upstream to set a limit for debugging; otherwise scrape all.
+        "max_topics": state.get("max_topics"),
+    }
 
-    except Exception as e:
-        print(f"[FAIL] Planning error: {str(e)}")
-        return {
-            **state,
-            "workflow_status": "failed",
-            "error_message": f"Planning error: {str(e)}",
-            "current_step": "failed",
-        }
+    print(f"\n[SEARCH] Searching with terms: {scraper_state['search_terms']}")
+    print(f"   Using EU Portal filters...")
 
+    return scraper_state
 
-def retrieval_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
-    """Identify query parameters and scrape the portals."""
-    print("\n" + "=" * 70)
-    print("STEP 3: RETRIEVAL / WEB SCRAPING")
-    print("=" * 70)
 
-    try:
-        # Prepare state for scraper node
-        # Note: `max_topics=2` was a temporary test limit. Keeping it in production
-        # can easily lead to misleading empty/too-small result sets.
-        scraper_state = {
-            "search_terms": state.get("search_terms", []),
-            "search_query": state.get("search_query", {}),
-            "headless": True,  # Run headless in production
-            # Allow upstream to set a limit for debugging; otherwise scrape all.
-            "max_topics": state.get("max_topics"),
-        }
+def _retrieval_done(state: WorkflowState, scraped_topics: list) -> Dict[str, Any]:
+    return {
+        "scraped_topics": scraped_topics,
+        "current_step": "analysis",
+        "workflow_status": "running",
+    }
 
-        print(f"\n[SEARCH] Searching with terms: {scraper_state['search_terms']}")
-        print(f"   Using EU Portal filters...")
 
-        # Call scraper node
-        result = scrape_topics_node(scraper_state)
-        scraped_topics = result.get("scraped_topics", [])
+def _retrieval_error(state: WorkflowState, error: Exception) -> Dict[str, Any]:
+    return {
+        "retrieval_errors": [str(error)],
+        "workflow_status": "failed",
+        "error_message": f"Retrieval error: {str(error)}",
+        "current_step": "failed",
+    }
 
-        print(f"\n[OK] Retrieved {len(scraped_topics)} topics")
 
-        if scraped_topics:
-            print(f"\n   First topic: {scraped_topics[0].get('title', 'N/A')[:60]}...")
+def retrieval_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """Identify query parameters and scrape the portals."""
+    _print_header("STEP 3: RETRIEVAL / WEB SCRAPING")
 
-        return {
-            **state,
-            "scraped_topics": scraped_topics,
-            "current_step": "analysis",
-            "workflow_status": "running",
-        }
+    if _plan_repeated(state):
+        # Same searches as the last iteration: scraping again finds the same topics
+        print("\n[SKIP] Plan unchanged since the last iteration, reusing its results")
+        return _retrieval_done(state, state.get("scraped_topics", []))
+
+    try:
+        scraper_state = _retrieval_state(state)
+        scraped_topics = asyncio.run(_scrape_search_terms(scraper_state))
+        return _retrieval_done(state, scraped_topics)
 
     except Exception as e:
-        print(f"[FAIL] Retrieval error: {str(e)}")
-        return {
-            **state,
-            "retrieval_errors": [str(e)],
-            "workflow_status": "failed",
-            "error_message": f"Retrieval error: {str(e)}",
-            "current_step": "failed",
-        }
+        return _retrieval_error(state, e)
 
 
-def analysis_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
-    """Analyze and score the retrieved calls against company profile."""
+async def retrieval_node_async(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """Async variant of retrieval_node, used when the graph runs through the async API."""
+    _print_header("STEP 3: RETRIEVAL / WEB SCRAPING")
 
-    print("\n" + "=" * 70)
-    print("STEP 4: ANALYSIS")
-    print("=" * 70)
+    if _plan_repeated(state):
+        # Same searches as the last iteration: scraping again finds the same topics
+        print("\n[SKIP] Plan unchanged since the last iteration, reusing its results")
+        return _retrieval_done(state, state.get("scraped_topics", []))
 
-    # Extract abort_event from LangGraph config if present
-    # kwargs["config"]["configurable"]["abort_event"]
-    config = kwargs.get("config", {})
-    configurable = config.get("configurable", {})
-    abort_event = configurable.get("abort_event")
+    try:
+        scraper_state = _retrieval_state(state)
+        scraped_topics = await _scrape_search_terms(scraper_state)
+        return _retrieval_done(state, scraped_topics)
 
-    scraped_topics = state.get("scraped_topics", [])
-    company_input = state.get("company_input", {})
+    except Exception as e:
+        return _retrieval_error(state, e)
+
+
+def _no_topics(state: WorkflowState) -> Dict[str, Any]:
+    """Outcome of an analysis step that got no scraped topics."""
     planner_iterations = state.get("planner_iterations", 0)
     max_iterations = state.get("max_planner_iterations", 3)
 
-    print(f"\n[STATS] Analyzing {len(scraped_topics)} scraped topics...")
+    # No results - need to refine plan, unless refining already failed
+    # to change it. Calls analyzed in earlier iterations are kept.
+    if _plan_repeated(state):
+        print(
+            "\n[WARN]  No topics found and the refined plan is unchanged. Continuing with empty results."
+        )
+        return {
+            "plan_approved": True,
+            "current_step": "reporting",
+            "workflow_status": "running",
+        }
+    if planner_iterations < max_iterations:
+        print(
+            f"\n[WARN]  No topics found. Refining plan (iteration {planner_iterations + 1}/{max_iterations})"
+        )
+        return {
+            "plan_approved": False,
+            "plan_feedback": "No topics found with current search terms. Try broader keywords.",
+            "current_step": "planning",
+            "workflow_status": "running",
+        }
+    else:
+        print(
+            f"\n[WARN]  No topics found after {max_iterations} attempts. Continuing with empty results."
+        )
+        return {
+            "plan_approved": True,
+            "current_step": "reporting",
+            "workflow_status": "running",
+        }
 
-    if len(scraped_topics) == 0:
-        # No results - need to refine plan
-        if planner_iterations < max_iterations:
-            print(
-                f"\n[WARN]  No topics found. Refining plan (iteration {planner_iterations + 1}/{max_iterations})"
-            )
-            return {
-                **state,
-                "plan_approved": False,
-                "plan_feedback": "No topics found with current search terms. Try broader keywords.",
-                "current_step": "planning",
-                "workflow_status": "running",
-            }
-        else:
-            print(
-                f"\n[WARN]  No topics found after {max_iterations} attempts. Continuing with empty results."
-            )
-            return {
-                **state,
-                "plan_approved": True,
-                "analyzed_calls": [],
-                "current_step": "reporting",
-                "workflow_status": "running",
-            }
 
-    # Extract company profile for analysis
-    company_profile = company_input.get("company", {})
-    analyzed_calls = []
+def _skip_ineligible() -> bool:
+    """True unless CRITIC_SKIP_INELIGIBLE=false sends every topic to the LLM."""
+    return os.getenv("CRITIC_SKIP_INELIGIBLE", "true").lower() == "true"
 
-    print(f"\n[SEARCH] Running detailed analysis on {len(scraped_topics)} calls...")
 
-    for i, topic in enumerate(scraped_topics, 1):
-        if abort_event and abort_event.is_set():
-            print("\n[ANALYSIS] Aborted by client")
-            break
+def _critic_for(eligibility: Dict[str, Any]) -> str:
+    """
+    Name of the qualitative analysis to run for a topic.
 
-        print(
-            f"\n  [{i}/{len(scraped_topics)}] Analyzing: {topic.get('title', 'N/A')[:50]}..."
-        )
+    Topics that fail the hard eligibility constraints get the rule-based
+    analysis instead of an LLM call, unless CRITIC_SKIP_INELIGIBLE=false.
+    """
+    if eligibility["all_passed"] or not _skip_ineligible():
+        return "perform_qualitative_analysis"
+    return "perform_rule_based_analysis"
 
-        # Step 1: Check eligibility (hard constraints)
-        eligibility = apply_eligibility_filters(topic, company_profile)
-        print(f"      Eligibility: {'PASS' if eligibility['all_passed'] else 'FAIL'}")
 
-        # Step 2: Get qualitative analysis from LLM Critic
-        try:
-            qualitative = perform_qualitative_analysis(topic, company_profile)
-            print(
-                f"      Qualitative: {qualitative.get('match_summary', 'N/A')[:60]}..."
-            )
-        except Exception as e:
-            print(f"      Qualitative: Error - {str(e)[:50]}")
-            qualitative = {
+async def _critique_topic(
+    topic: Dict[str, Any],
+    company_profile: Dict[str, Any],
+    critic: str,
+    qualitative: Optional[Dict[str, Any]] = None,
+) -> tuple:
+    """
+    Get the qualitative analysis named by critic and its log line for one topic.
+
+    A qualitative analysis already obtained from a batch run is used as is.
+    """
+    try:
+        if qualitative is None:
+            qualitative = await _to_thread(_lazy(critic), topic, company_profile)
+        return (
+            qualitative,
+            f"      Qualitative: {qualitative.get('match_summary', 'N/A')[:60]}...",
+        )
+    except Exception as e:
+        return (
+            {
                 "match_summary": "Analysis unavailable",
                 "domain_matches": [],
                 "keyword_hits": [],
                 "analysis_method": "error",
-            }
+            },
+            f"      Qualitative: Error - {str(e)[:50]}",
+        )
 
-        # Step 3: Calculate weighted score
-        try:
-            scoring = score_call(topic, company_profile, qualitative)
-            print(
-                f"      Score: {scoring['total']}/10 ({scoring['recommendation']['label']})"
+
+async def _analyze_topic(
+    topic: Dict[str, Any],
+    company_profile: Dict[str, Any],
+    label: str,
+    qualitative: Optional[Dict[str, Any]] = None,
+    eligibility: Optional[Dict[str, Any]] = None,
+    profile_terms: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run eligibility, the LLM critic and the scorer for one topic.
+
+    Eligibility and qualitative analysis already computed for a batch run
+    are used as is. profile_terms is the scorer's precomputed profile.
+    """
+    topic_get = topic.get
+    general_info = topic_get("general_info") or _EMPTY
+    content = topic_get("content")
+    if not isinstance(content, dict):
+        content = _EMPTY
+
+    # Per-topic results are printed together once the topic is done, so
+    # concurrently analyzed topics don't interleave their lines
+    lines = [f"\n  {label} Analyzing: {topic_get('title', 'N/A')[:50]}..."]
+
+    if eligibility is None and not _skip_ineligible():
+        # Steps 1 and 2 are independent when every topic goes to the LLM:
+        # check eligibility (hard constraints) while the LLM Critic call is
+        # in flight; only scoring needs both
+        eligibility, (qualitative, critic_line) = await asyncio.gather(
+            _to_thread(_lazy("apply_eligibility_filters"), topic, company_profile),
+            _critique_topic(
+                topic, company_profile, "perform_qualitative_analysis", qualitative
+            ),
+        )
+    else:
+        # Step 1: Check eligibility (hard constraints). It is cheap and
+        # decides whether the topic is worth an LLM call
+        if eligibility is None:
+            eligibility = await _to_thread(
+                _lazy("apply_eligibility_filters"), topic, company_profile
             )
-        except Exception as e:
-            print(f"      Score: Error - {str(e)[:50]}")
-            scoring = {
-                "total": 5.0,
-                "domain_match": 5.0,
-                "keyword_match": 5.0,
-                "eligibility_fit": 5.0,
-                "budget_feasibility": 5.0,
-                "strategic_value": 5.0,
-                "deadline_comfort": 5.0,
-                "recommendation": {
-                    "action": "consider",
-                    "label": "ОБМИСЛЕТЕ",
-                    "color": "yellow",
-                },
-            }
 
-        # Build analyzed call record
-        analyzed_call = {
-            "id": topic.get("id"),
-            "title": topic.get("title"),
-            "url": topic.get("url"),
-            "status": topic.get("status"),
-            "programme": topic.get("general_info", {}).get("programme", "Unknown"),
-            "relevance_score": scoring["total"],
-            "eligibility_passed": eligibility["all_passed"],
-            "eligibility_details": eligibility,
-            "score_breakdown": {
-                "domain_match": scoring["domain_match"],
-                "keyword_match": scoring["keyword_match"],
-                "eligibility_fit": scoring["eligibility_fit"],
-                "budget_feasibility": scoring["budget_feasibility"],
-                "strategic_value": scoring["strategic_value"],
-                "deadline_comfort": scoring["deadline_comfort"],
-            },
-            "recommendation": scoring["recommendation"],
-            "match_summary": qualitative.get("match_summary", ""),
-            "domain_matches": qualitative.get("domain_matches", []),
-            "keyword_hits": qualitative.get("keyword_hits", []),
-            "suggested_partners": qualitative.get("suggested_partners", []),
-            "estimated_effort": qualitative.get("estimated_effort_hours", "80-150"),
-            "deadline": topic.get("general_info", {})
-            .get("dates", {})
-            .get("deadline", "N/A"),
-            # Prefer the per-topic extracted budget from retrieval; fall back to general_info
-            "budget": topic.get("budget")
-            or topic.get("general_info", {}).get("budget")
-            or topic.get("content", {}).get("budget_overview")
-            or "N/A",
-            # More actionable than total topic budget: indicative EU contribution per project (if available)
-            "contribution": topic.get("contribution", "N/A"),
-            # Keep the full budget table accessible to the frontend
-            "content": {
-                **(
-                    topic.get("content", {})
-                    if isinstance(topic.get("content"), dict)
-                    else {}
-                ),
-                "budget_overview": (
-                    (
-                        topic.get("content", {})
-                        if isinstance(topic.get("content"), dict)
-                        else {}
-                    ).get("budget_overview")
-                    or ""
-                ),
+        # Step 2: Get qualitative analysis from LLM Critic
+        qualitative, critic_line = await _critique_topic(
+            topic, company_profile, _critic_for(eligibility), qualitative
+        )
+    lines.append(
+        f"      Eligibility: {'PASS' if eligibility['all_passed'] else 'FAIL'}"
+    )
+    lines.append(critic_line)
+
+    # Step 3: Calculate weighted score
+    try:
+        scoring = _lazy("score_call")(
+            topic, company_profile, qualitative, precomputed=profile_terms
+        )
+        lines.append(
+            f"      Score: {scoring['total']}/10 ({scoring['recommendation']['label']})"
+        )
+    except Exception as e:
+        lines.append(f"      Score: Error - {str(e)[:50]}")
+        scoring = {
+            "total": 5.0,
+            "domain_match": 5.0,
+            "keyword_match": 5.0,
+            "eligibility_fit": 5.0,
+            "budget_feasibility": 5.0,
+            "strategic_value": 5.0,
+            "deadline_comfort": 5.0,
+            "recommendation": {
+                "action": "consider",
+                "label": "ОБМИСЛЕТЕ",
+                "color": "yellow",
             },
-            "analysis_method": qualitative.get("analysis_method", "rule_based"),
         }
 
-        analyzed_calls.append(analyzed_call)
+    if not _quiet():
+        print("\n".join(lines))
+
+    # Build analyzed call record
+    qualitative_get = qualitative.get
+    return {
+        "id": topic_get("id"),
+        "title": topic_get("title"),
+        "url": topic_get("url"),
+        "status": topic_get("status"),
+        "programme": general_info.get("programme", "Unknown"),
+        "relevance_score": scoring["total"],
+        "eligibility_passed": eligibility["all_passed"],
+        "eligibility_details": eligibility,
+        "score_breakdown": dict(
+            zip(_SCORE_BREAKDOWN_FIELDS, _score_breakdown(scoring))
+        ),
+        "recommendation": scoring["recommendation"],
+        "match_summary": qualitative_get("match_summary", ""),
+        "domain_matches": qualitative_get("domain_matches", []),
+        "keyword_hits": qualitative_get("keyword_hits", []),
+        "suggested_partners": qualitative_get("suggested_partners", []),
+        "estimated_effort": qualitative_get("estimated_effort_hours", "80-150"),
+        "deadline": (general_info.get("dates") or _EMPTY).get("deadline", "N/A"),
+        # Prefer the per-topic extracted budget from retrieval; fall back to general_info
+        "budget": topic_get("budget")
+        or general_info.get("budget")
+        or content.get("budget_overview")
+        or "N/A",
+        # More actionable than total topic budget: indicative EU contribution per project (if available)
+        "contribution": topic_get("contribution", "N/A"),
+        # Keep the full budget table accessible to the frontend
+        "content": {
+            **content,
+            "budget_overview": content.get("budget_overview") or "",
+        },
+        "analysis_method": qualitative_get("analysis_method", "rule_based"),
+    }
+
+
+async def _analyze_topics(
+    scraped_topics: list,
+    company_profile: Dict[str, Any],
+    analyzed_by_id: Dict[Any, Dict[str, Any]],
+    abort_event=None,
+    batch_mode: bool = False,
+) -> None:
+    """
+    Analyze the topics not yet in analyzed_by_id, concurrently.
+
+    At most ANALYSIS_CONCURRENCY (default 8) topics are in flight at once;
+    the LLM critic call runs on the shared executor. In batch mode the critic
+    calls of eligible topics are sent up front as one Batch API job instead.
+    Results are added to analyzed_by_id in topic order.
+    """
+    total = len(scraped_topics)
+    semaphore = asyncio.BoundedSemaphore(int(os.getenv("ANALYSIS_CONCURRENCY", "8")))
+    pending = []
+    # Normalized profile fields for the scorer, shared by every topic
+    try:
+        profile_terms = _lazy("precompute_profile")(company_profile)
+    except Exception:
+        # Malformed profile: let each topic's scoring fail and fall back
+        profile_terms = None
+
+    for i, topic in enumerate(scraped_topics, 1):
+        topic_id = topic.get("id")
+        if topic_id in analyzed_by_id:
+            print(f"\n  [{i}/{total}] Already analyzed: {topic_id}")
+            continue
+        pending.append((i, topic))
+
+    critiques = eligibilities = _EMPTY
+    if batch_mode and pending:
+        # Check eligibility up front so the batch only holds LLM-worthy topics
+        apply_eligibility_filters = _lazy("apply_eligibility_filters")
+        checked = await asyncio.gather(
+            *(
+                _to_thread(apply_eligibility_filters, topic, company_profile)
+                for _, topic in pending
+            )
+        )
+        eligibilities = {
+            topic.get("id"): eligibility
+            for (_, topic), eligibility in zip(pending, checked)
+        }
+        batch_topics = [
+            topic
+            for (_, topic), eligibility in zip(pending, checked)
+            if _critic_for(eligibility) == "perform_qualitative_analysis"
+        ]
+        if batch_topics:
+            print(
+                f"\n[LLM] Submitting {len(batch_topics)} critic calls as one batch..."
+            )
+            try:
+                critiques = await _to_thread(
+                    _lazy("perform_qualitative_analysis_batch"),
+                    batch_topics,
+                    company_profile,
+                    abort_event,
+                )
+            except Exception as e:
+                print(f"   [WARN] Batch analysis failed, analyzing per topic: {e}")
+
+    async def analyze(i: int, topic: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            # Topics still waiting for a slot are dropped once the client aborts
+            if abort_event and abort_event.is_set():
+                return None
+            return await _analyze_topic(
+                topic,
+                company_profile,
+                f"[{i}/{total}]",
+                critiques.get(topic.get("id")),
+                eligibilities.get(topic.get("id")),
+                profile_terms,
+            )
+
+    results = await asyncio.gather(*(analyze(i, topic) for i, topic in pending))
+
+    if abort_event and abort_event.is_set():
+        print("\n[ANALYSIS] Aborted by client")
+
+    for analyzed_call in results:
+        if analyzed_call is not None:
+            analyzed_by_id[analyzed_call["id"]] = analyzed_call
+
+
+def _analysis_outcome(
+    state: WorkflowState, analyzed_by_id: Dict[Any, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Reflect on the analyzed calls and decide whether to refine or report."""
+    planner_iterations = state.get("planner_iterations", 0)
+    max_iterations = state.get("max_planner_iterations", 3)
+    analyzed_calls = list(analyzed_by_id.values())
 
     # Step 4: Use reflection to decide next action
     print(f"\n[THINK] Evaluating results and deciding next step...")
@@ -604,21 +850,16 @@ def analysis_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
         "portals": ["ftop", "eufunds_bg"],
     }
 
-    reflection = reflect_on_results(analyzed_calls, search_params, planner_iterations)
-
-    print(f"\n[CHART] Analysis Summary:")
-    print(f"   Total analyzed: {len(analyzed_calls)}")
-    print(f"   High scores (8+): {reflection['stats']['high_scores']}")
-    print(f"   Medium scores (6-8): {reflection['stats']['medium_scores']}")
-    print(f"   Average score: {reflection['stats']['average_score']}/10")
-    print(f"   Decision: {reflection['decision'].upper()}")
-    print(f"   Reasoning: {reflection['reasoning']}")
+    reflection = _lazy("reflect_on_results")(analyzed_calls, search_params, planner_iterations)
 
-    # Decide whether to loop or continue
-    if reflection["decision"] == "finalize" or planner_iterations >= max_iterations:
-        print(f"\n[OK] Analysis complete. Proceeding to reporting...")
+    # Decide whether to loop or continue. Refining is pointless once a
+    # refinement left the plan unchanged: the next one would search the same.
+    if (
+        reflection["decision"] == "finalize"
+        or planner_iterations >= max_iterations
+        or _plan_repeated(state)
+    ):
         return {
-            **state,
             "analyzed_calls": analyzed_calls,
             "plan_approved": True,
             "current_step": "reporting",
@@ -626,10 +867,8 @@ def analysis_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
             "analysis_summary": reflection,
         }
     elif reflection["decision"] == "refine":
-        print(f"\n[WARN] Results need refinement. Looping back to planner...")
         recommendations = "; ".join(reflection["recommendations"])
         return {
-            **state,
             "analyzed_calls": analyzed_calls,
             "plan_approved": False,
             "plan_feedback": f"Results need refinement: {recommendations}",
@@ -639,9 +878,7 @@ def analysis_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
         }
     else:
         # expand or other decisions - continue with what we have
-        print(f"\n[OK] Continuing with current results...")
         return {
-            **state,
             "analyzed_calls": analyzed_calls,
             "plan_approved": True,
             "current_step": "reporting",
@@ -650,174 +887,267 @@ def analysis_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
         }
 
 
-def reporter_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
-    """Generate final report for the approved calls."""
-    print("\n" + "=" * 70)
-    print("STEP 5: REPORTING")
-    print("=" * 70)
-
-    analyzed_calls = state.get("analyzed_calls", [])
-    company_input = state.get("company_input", {})
+def _analysis_inputs(state: WorkflowState, **kwargs):
+    """Print the step header and collect what the analysis needs from state."""
+    _print_header("STEP 4: ANALYSIS")
 
-    print(
-        f"\n[REPORT] Generating comprehensive report for {len(analyzed_calls)} calls..."
-    )
+    # Extract abort_event from LangGraph config if present
+    # kwargs["config"]["configurable"]["abort_event"]
+    config = kwargs.get("config", {})
+    configurable = config.get("configurable", {})
+    abort_event = configurable.get("abort_event")
 
-    try:
-        # Use the LLM-powered reporter module
-        print("[REPORT] Calling generate_comprehensive_report...")
-        report = generate_comprehensive_report(analyzed_calls, company_input)
+    scraped_topics = state.get("scraped_topics", [])
+    print(f"\n[STATS] Analyzing {len(scraped_topics)} scraped topics...")
 
-        print(f"\n[OK] LLM Report generated!")
-        print(f"   Report type: {report.get('report_type', 'unknown')}")
-        print(f"   Total calls: {report.get('total_calls', 0)}")
-        print(f"   Funding cards: {len(report.get('funding_cards', []))}")
+    # Extract company profile for analysis
+    company_profile = state.get("company_input", {}).get("company", {})
+    # Calls analyzed in earlier planner iterations, keyed by topic id, so a
+    # topic found again after a refinement is not analyzed twice
+    analyzed_by_id = {call["id"]: call for call in state.get("analyzed_calls") or []}
 
-        # Debug: Print first card details
-        if report.get("funding_cards"):
-            first_card = report["funding_cards"][0]
-            print(f"\n[DEBUG] First card details:")
-            print(f"   Title: {first_card.get('title', 'N/A')}")
-            print(
-                f"   Short summary: {first_card.get('short_summary', 'N/A')[:100]}..."
-            )
-            print(
-                f"   Why recommended: {first_card.get('why_recommended', 'N/A')[:100]}..."
-            )
+    return scraped_topics, company_profile, analyzed_by_id, abort_event
 
-        # Save full report to JSON for debugging
-        import json
 
-        debug_file = f"final_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(debug_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-        print(f"\n[REPORT] Full report saved to: {debug_file}")
+def analysis_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """Analyze and score the retrieved calls against company profile."""
+    scraped_topics, company_profile, analyzed_by_id, abort_event = _analysis_inputs(
+        state, **kwargs
+    )
+    if len(scraped_topics) == 0:
+        return _no_topics(state)
 
-    except Exception as e:
-        print(f"\n[ERROR] LLM report failed: {e}")
-        import traceback
+    print(f"\n[SEARCH] Running detailed analysis on {len(scraped_topics)} calls...")
+    asyncio.run(
+        _analyze_topics(
+            scraped_topics,
+            company_profile,
+            analyzed_by_id,
+            abort_event,
+            state.get("batch_mode", False),
+        )
+    )
+    return _analysis_outcome(state, analyzed_by_id)
 
-        traceback.print_exc()
-        print("[REPORT] Falling back to basic report generation...")
 
-        # Fallback to basic report generation inline
-        company = (
-            company_input.get("company", {}) if isinstance(company_input, dict) else {}
-        )
+async def analysis_node_async(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """Async variant of analysis_node, used when the graph runs through the async API."""
+    scraped_topics, company_profile, analyzed_by_id, abort_event = _analysis_inputs(
+        state, **kwargs
+    )
+    if len(scraped_topics) == 0:
+        return _no_topics(state)
 
-        # Build funding cards from analyzed calls
-        funding_cards = []
-        for call in analyzed_calls:
-            relevance = call.get("relevance_score", 0)
-            match_pct = int(relevance * 10)
-
-            card = {
-                "id": call.get("id", ""),
-                "title": call.get("title", "Untitled"),
-                "programme": call.get("programme", ""),
-                "description": call.get("raw_data", {}).get("description", "")[:500]
-                if call.get("raw_data")
-                else call.get("description", ""),
-                "short_summary": call.get("match_summary", ""),
-                "match_percentage": match_pct,
-                "relevance_score": relevance,
-                "eligibility_passed": call.get("eligibility_passed", False),
-                "budget": call.get("budget", "N/A"),
-                "deadline": call.get("deadline", "N/A"),
-                "url": call.get("url", ""),
-                "status": call.get("status", ""),
-                "tags": call.get("keyword_hits", []),
-                "why_recommended": call.get("match_summary", "")
-                if call.get("match_summary")
-                else f"Match score: {relevance}/10",
-                "key_benefits": [f"Relevance score: {relevance}/10"]
-                if relevance > 0
-                else [],
-                "action_items": [
-                    "Review full call details",
-                    "Check eligibility requirements",
-                    f"Note deadline: {call.get('deadline', 'TBD')}",
-                ],
-                "success_probability": "high"
-                if match_pct >= 80
-                else "medium"
-                if match_pct >= 60
-                else "low",
-                "domain_matches": call.get("domain_matches", []),
-                "suggested_partners": call.get("suggested_partners", []),
-            }
-            funding_cards.append(card)
+    print(f"\n[SEARCH] Running detailed analysis on {len(scraped_topics)} calls...")
+    await _analyze_topics(
+        scraped_topics,
+        company_profile,
+        analyzed_by_id,
+        abort_event,
+        state.get("batch_mode", False),
+    )
+    return _analysis_outcome(state, analyzed_by_id)
 
-        # Sort by match percentage
-        funding_cards.sort(key=lambda x: x["match_percentage"], reverse=True)
 
-        # Apply final visibility threshold (only show 60%+ matches in results)
-        funding_cards = [c for c in funding_cards if c.get("match_percentage", 0) >= 60]
+def _fallback_report(
+    analyzed_calls: list, company_input: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build a basic report from the analyzed calls without the LLM."""
+    company = (
+        company_input.get("company", {}) if isinstance(company_input, dict) else {}
+    )
 
-        # Count priorities (after threshold)
-        # High: 80+, Medium: 70-79, Low: 60-69
-        high_priority = len([c for c in funding_cards if c["match_percentage"] >= 80])
-        medium_priority = len(
-            [c for c in funding_cards if 70 <= c["match_percentage"] < 80]
-        )
-        low_priority = len(
-            [c for c in funding_cards if 60 <= c["match_percentage"] < 70]
-        )
-        # Build fallback report
-        report = {
-            "company_profile": {
-                "name": company.get("name", "Unknown"),
-                "type": company.get("type", ""),
-                "country": company.get("country", ""),
-                "city": company.get("city", ""),
-                "employees": company.get("employees", 0),
-                "description": company.get("description", ""),
-                "domains": company.get("domains", []),
-            },
-            "company_summary": {
-                "profile_overview": f"{company.get('name', 'Company')} is a {company.get('type', 'organization')} based in {company.get('country', 'EU')}.",
-                "key_strengths": [
-                    d.get("name", "")
-                    for d in company.get("domains", [])
-                    if d.get("name")
-                ],
-                "recommended_focus_areas": [],
-            },
-            "overall_assessment": {
-                "total_opportunities": high_priority + medium_priority + low_priority,
-                "high_priority_count": high_priority,
-                "medium_priority_count": medium_priority,
-                "low_priority_count": low_priority,
-                "summary_text": f"Found {high_priority + medium_priority + low_priority} relevant EU funding calls matching your profile (60%+ match).",
-                "strategic_advice": "Focus on high-priority opportunities (80%+ match) first, then medium (70-79%).",
-            },
-            "funding_cards": funding_cards,
-            "top_recommendations": [
-                {
-                    "call_id": c["id"],
-                    "priority_rank": i + 1,
-                    "match_percentage": c["match_percentage"],
-                    "why_recommended": c["why_recommended"],
-                    "success_probability": c["success_probability"],
-                }
-                for i, c in enumerate(funding_cards[:3])
+    # Build funding cards from analyzed calls, applying the final visibility
+    # threshold (only show 60%+ matches in results) before building a card
+    funding_cards = []
+    for call in analyzed_calls:
+        call_get = call.get
+        relevance = call_get("relevance_score", 0)
+        match_pct = int(relevance * 10)
+        if match_pct < 60:
+            continue
+        description = (call_get("content") or _EMPTY).get(
+            "description"
+        ) or call_get("description", "")
+        match_summary = call_get("match_summary", "")
+
+        card = {
+            "id": call_get("id", ""),
+            "title": call_get("title", "Untitled"),
+            "programme": call_get("programme", ""),
+            "description": description[:500],
+            "short_summary": match_summary,
+            "match_percentage": match_pct,
+            "relevance_score": relevance,
+            "eligibility_passed": call_get("eligibility_passed", False),
+            "budget": call_get("budget", "N/A"),
+            "deadline": call_get("deadline", "N/A"),
+            "url": call_get("url", ""),
+            "status": call_get("status", ""),
+            "tags": call_get("keyword_hits", []),
+            "why_recommended": match_summary or f"Match score: {relevance}/10",
+            "key_benefits": [f"Relevance score: {relevance}/10"]
+            if relevance > 0
+            else [],
+            "action_items": [
+                "Review full call details",
+                "Check eligibility requirements",
+                f"Note deadline: {call_get('deadline', 'TBD')}",
             ],
-            "total_calls": len(analyzed_calls),
-            "report_type": "fallback",
-            "generated_at": datetime.now().isoformat(),
+            "success_probability": "high"
+            if match_pct >= 80
+            else "medium"
+            if match_pct >= 60
+            else "low",
+            "domain_matches": call_get("domain_matches", []),
+            "suggested_partners": call_get("suggested_partners", []),
         }
+        funding_cards.append(card)
+
+    # Sort by match percentage; the cards are shown in this order, and the
+    # first three are the top recommendations
+    funding_cards.sort(key=itemgetter("match_percentage"), reverse=True)
+
+    # Count priorities (after threshold) in one pass
+    # High: 80+, Medium: 70-79, Low: 60-69
+    high_priority = medium_priority = low_priority = 0
+    for card in funding_cards:
+        match_pct = card["match_percentage"]
+        if match_pct >= 80:
+            high_priority += 1
+        elif match_pct >= 70:
+            medium_priority += 1
+        else:
+            low_priority += 1
+    # Build fallback report
+    finished_at = datetime.now().isoformat()
+    report = {
+        "company_profile": {
+            "name": company.get("name", "Unknown"),
+            "type": company.get("type", ""),
+            "country": company.get("country", ""),
+            "city": company.get("city", ""),
+            "employees": company.get("employees", 0),
+            "description": company.get("description", ""),
+            "domains": company.get("domains", []),
+        },
+        "company_summary": {
+            "profile_overview": f"{company.get('name', 'Company')} is a {company.get('type', 'organization')} based in {company.get('country', 'EU')}.",
+            "key_strengths": [
+                d.get("name", "")
+                for d in company.get("domains", [])
+                if d.get("name")
+            ],
+            "recommended_focus_areas": [],
+        },
+        "overall_assessment": {
+            "total_opportunities": high_priority + medium_priority + low_priority,
+            "high_priority_count": high_priority,
+            "medium_priority_count": medium_priority,
+            "low_priority_count": low_priority,
+            "summary_text": f"Found {high_priority + medium_priority + low_priority} relevant EU funding calls matching your profile (60%+ match).",
+            "strategic_advice": "Focus on high-priority opportunities (80%+ match) first, then medium (70-79%).",
+        },
+        "funding_cards": funding_cards,
+        "top_recommendations": [
+            {
+                "call_id": c["id"],
+                "priority_rank": i + 1,
+                "match_percentage": c["match_percentage"],
+                "why_recommended": c["why_recommended"],
+                "success_probability": c["success_probability"],
+            }
+            for i, c in enumerate(funding_cards[:3])
+        ],
+        "total_calls": len(analyzed_calls),
+        "report_type": "fallback",
+        "generated_at": finished_at,
+    }
+
+    return report
+
+
+def _save_debug_report(report: Dict[str, Any], finished_at: datetime) -> None:
+    """Save the full report to a JSON file when SAVE_DEBUG_REPORT is true."""
+    if os.getenv("SAVE_DEBUG_REPORT", "false").lower() != "true":
+        return
+
+    debug_file = f"final_report_{finished_at.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(debug_file, "wb") as f:
+        f.write(_report_json(report))
+    print(f"\n[REPORT] Full report saved to: {debug_file}")
+
+
+def _reporter_inputs(state: WorkflowState):
+    _print_header("STEP 5: REPORTING")
+
+    analyzed_calls = state.get("analyzed_calls", [])
+    company_input = state.get("company_input", {})
 
-        print(f"\n[OK] Fallback report generated!")
+    print(
+        f"\n[REPORT] Generating comprehensive report for {len(analyzed_calls)} calls..."
+    )
+    # Use the LLM-powered reporter module
+    print("[REPORT] Calling generate_comprehensive_report...")
+
+    return analyzed_calls, company_input
+
+
+def _report_failed(
+    error: Exception, analyzed_calls: list, company_input: Dict[str, Any]
+) -> Dict[str, Any]:
+    print(f"\n[ERROR] LLM report failed: {error}")
+    import traceback
 
+    traceback.print_exc()
+    print("[REPORT] Falling back to basic report generation...")
+
+    report = _fallback_report(analyzed_calls, company_input)
+    # The fallback report's generated_at doubles as the end time
+    return _reporter_done(report, report["generated_at"])
+
+
+def _reporter_done(report: Dict[str, Any], finished_at: str) -> Dict[str, Any]:
     return {
-        **state,
         "final_report": report,
         "workflow_status": "completed",
         "current_step": END,
-        "end_time": datetime.now().isoformat(),
+        "end_time": finished_at,
     }
 
 
+def reporter_node(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """Generate final report for the approved calls."""
+    analyzed_calls, company_input = _reporter_inputs(state)
+
+    try:
+        report = _lazy("generate_comprehensive_report")(analyzed_calls, company_input)
+        # One timestamp for the debug file name and the end time
+        finished_at = datetime.now()
+        _save_debug_report(report, finished_at)
+    except Exception as e:
+        return _report_failed(e, analyzed_calls, company_input)
+
+    return _reporter_done(report, finished_at.isoformat())
+
+
+async def reporter_node_async(state: WorkflowState, **kwargs) -> Dict[str, Any]:
+    """Async variant of reporter_node, used when the graph runs through the async API."""
+    analyzed_calls, company_input = _reporter_inputs(state)
+
+    try:
+        report = await _to_thread(
+            _lazy("generate_comprehensive_report"), analyzed_calls, company_input
+        )
+        # One timestamp for the debug file name and the end time
+        finished_at = datetime.now()
+        await _to_thread(_save_debug_report, report, finished_at)
+    except Exception as e:
+        return _report_failed(e, analyzed_calls, company_input)
+
+    return _reporter_done(report, finished_at.isoformat())
+
+
 # ==================== CONDITIONAL EDGES ====================
 
 
@@ -843,18 +1173,31 @@ def should_continue_after_analysis(
 # ==================== WORKFLOW CONSTRUCTION ====================
 
 
-def create_workflow() -> StateGraph:
+def create_workflow() -> "StateGraph":
     """Create and configure the LangGraph workflow."""
+    graph = _import_langgraph()
+    from langchain_core.runnables import RunnableLambda
 
     # Initialize the graph with our state type
-    workflow = StateGraph(WorkflowState)
+    workflow = graph.StateGraph(WorkflowState)
 
     # Add nodes
-    workflow.add_node("safety_check", safety_check_node)
+    # Sync runs (stream/invoke) use the plain nodes, async runs
+    # (astream/ainvoke) their *_async variants
+    workflow.add_node(
+        "safety_check",
+        RunnableLambda(safety_check_node, afunc=safety_check_node_async),
+    )
     workflow.add_node("planner", planner_node)
-    workflow.add_node("retrieval", retrieval_node)
-    workflow.add_node("analysis", analysis_node)
-    workflow.add_node("reporter", reporter_node)
+    workflow.add_node(
+        "retrieval", RunnableLambda(retrieval_node, afunc=retrieval_node_async)
+    )
+    workflow.add_node(
+        "analysis", RunnableLambda(analysis_node, afunc=analysis_node_async)
+    )
+    workflow.add_node(
+        "reporter", RunnableLambda(reporter_node, afunc=reporter_node_async)
+    )
 
     # Set entry point
     workflow.set_entry_point("safety_check")
@@ -886,87 +1229,259 @@ def create_workflow() -> StateGraph:
     return workflow
 
 
+class _PickleSerializer:
+    """
+    Checkpoint serializer for the in-memory checkpointer.
+    Checkpoints never leave the process, so pickle can replace the default
+    JSON serializer, which re-encodes every state snapshot at each step.
+    """
+
+    def dumps(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, protocol=5)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+def _default_checkpointer():
+    """
+    Checkpointer used when none is given.
+
+    In memory by default; CHECKPOINT_DB names a SQLite file to keep the
+    checkpoints of runs with an explicit thread_id across restarts.
+    """
+    db_path = os.getenv("CHECKPOINT_DB")
+    if not db_path:
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver(serde=_PickleSerializer())
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # The file outlives the process, so keep the default JSON serializer
+    return SqliteSaver.from_conn_string(db_path)
+
+
+@functools.lru_cache(maxsize=1)
+def _workflow_definition() -> "StateGraph":
+    """The workflow graph, built once; compiling it does not modify it."""
+    return create_workflow()
+
+
 def compile_workflow(checkpointer=None):
     """Compile the workflow with optional checkpointing."""
-    workflow = create_workflow()
+    workflow = _workflow_definition()
 
     if checkpointer is None:
-        checkpointer = MemorySaver()
+        checkpointer = _default_checkpointer()
 
     app = workflow.compile(checkpointer=checkpointer)
     return app
 
 
+_compiled_apps: Dict[bool, Any] = {}
+_compiled_app_lock = threading.Lock()
+
+
+def get_compiled_app(checkpointed: bool = True):
+    """
+    Return the shared compiled workflow, compiling it on first use.
+    The graph has no per-run configuration, so one app serves every run.
+    With checkpointed=False the app has no checkpointer, for runs that are
+    never resumed.
+    """
+    app = _compiled_apps.get(checkpointed)
+    if app is None:
+        with _compiled_app_lock:
+            app = _compiled_apps.get(checkpointed)
+            if app is None:
+                app = _compiled_apps[checkpointed] = (
+                    compile_workflow()
+                    if checkpointed
+                    else _workflow_definition().compile()
+                )
+    return app
+
+
 # ==================== EXECUTION FUNCTIONS ====================
 
 
+def _render_update(node: str, update: Dict[str, Any]) -> None:
+    """
+    Print the outcome of a finished node.
+    Nodes only print their step header and in-progress notes; this prints
+    their results (including the markers api/routes.py turns into progress).
+    """
+    if update.get("workflow_status") == "failed":
+        print(f"[FAIL] {update.get('error_message')}")
+        return
+
+    if node == "safety_check":
+        validation_result = update.get("validation_result") or {}
+        print("[OK] Safety check passed")
+        print(
+            f"[OK] Input validation passed (score: {validation_result.get('score')}/10)"
+        )
+
+    elif node == "planner":
+        plan = update.get("scraper_plan") or {}
+        plan_get = plan.get
+        analysis = plan_get("analysis", {})
+        search_queries = plan_get("search_queries", [])
+        target_programs = ", ".join(plan_get("target_programs", []))
+        lines = [
+            "\n[ANALYSIS RESULTS]:",
+            f"   Technologies Detected: {', '.join(analysis.get('technologies', []))}",
+            f"   Applications: {', '.join(analysis.get('applications', []))}",
+            f"   Focus Areas: {', '.join(analysis.get('focus_areas', [])[:3])}",
+            f"   Target EU Programs: {target_programs}",
+            "\n[OK] Smart Plan Created:",
+            f"   Company: {plan_get('company_name')}",
+            f"   Search Queries ({len(search_queries)}):",
+        ]
+        lines.extend(
+            f"      {i}. {query}" for i, query in enumerate(search_queries, 1)
+        )
+        lines.append(f"   Target Programs: {target_programs}")
+        lines.append(f"   Estimated Calls: {plan_get('estimated_calls')}")
+        lines.append(f"   Reasoning: {plan_get('reasoning')}")
+        print("\n".join(lines))
+
+    elif node == "retrieval":
+        scraped_topics = update.get("scraped_topics", [])
+        print(f"\n[OK] Retrieved {len(scraped_topics)} topics")
+        if scraped_topics:
+            print(
+                f"\n   First topic: {scraped_topics[0].get('title', 'N/A')[:60]}..."
+            )
+
+    elif node == "analysis":
+        reflection = update.get("analysis_summary")
+        if reflection is None:
+            # No topics to analyze; the node already reported why
+            return
+        stats = reflection["stats"]
+        print(
+            "\n".join(
+                [
+                    "\n[CHART] Analysis Summary:",
+                    f"   Total analyzed: {len(update.get('analyzed_calls', []))}",
+                    f"   High scores (8+): {stats['high_scores']}",
+                    f"   Medium scores (6-8): {stats['medium_scores']}",
+                    f"   Average score: {stats['average_score']}/10",
+                    f"   Decision: {reflection['decision'].upper()}",
+                    f"   Reasoning: {reflection['reasoning']}",
+                ]
+            )
+        )
+        if update.get("current_step") == "planning":
+            print("\n[WARN] Results need refinement. Looping back to planner...")
+        else:
+            print("\n[OK] Analysis complete. Proceeding to reporting...")
+
+    elif node == "reporter":
+        report = update.get("final_report") or {}
+        print(f"\n[OK] Report generated ({report.get('report_type', 'unknown')})")
+        print(f"   Total calls: {report.get('total_calls', 0)}")
+        print(f"   Funding cards: {len(report.get('funding_cards', []))}")
+
+
 def run_workflow(
-    company_input: Dict[str, Any], thread_id: str = None, abort_event: Any = None
+    company_input: Dict[str, Any],
+    thread_id: str = None,
+    abort_event: Any = None,
+    batch_mode: bool = False,
 ) -> Dict[str, Any]:
     """
     Run the complete workflow for a company.
 
     Args:
-        company_input: Company profile data
+        company_input: Company profile data, as a dict or a CompanyInput. A
+            model is kept as is until the safety check, which dumps it once
+            and runs the full (LLM) input validation on it.
         thread_id: Optional thread ID for persistence
         abort_event: Optional threading.Event to cancel execution
+        batch_mode: Send the LLM critic calls as one Batch API job. Cheaper,
+            but the analysis step waits for the batch, so only for offline runs.
 
     Returns:
         Final workflow state with results
     """
     # Create initial state
-    initial_state = create_initial_state(company_input)
+    initial_state = create_initial_state(company_input, batch_mode=batch_mode)
 
-    # Compile workflow
-    app = compile_workflow()
+    # Only runs with a thread_id can be resumed, so the others skip
+    # checkpointing altogether
+    app = get_compiled_app(checkpointed=thread_id is not None)
 
     # Configure thread
     config = {
         "configurable": {
-            "thread_id": thread_id or "default",
+            "thread_id": thread_id,
             "abort_event": abort_event
         }
     }
 
+    return _run_stream(app, initial_state, config, abort_event)
+
+
+def _run_stream(
+    app, initial_state: WorkflowState, config: Dict[str, Any], abort_event: Any
+) -> Dict[str, Any]:
+    """Stream the workflow to completion and return its final state."""
     # Run workflow
-    print("\n" + "=" * 70)
-    print("STARTING EU CALL FINDER WORKFLOW")
-    print("=" * 70)
-
-    for event in app.stream(initial_state, config):
-        if abort_event and abort_event.is_set():
-            print("\n[API] Workflow aborted by client")
-            return {
-                "workflow_status": "failed",
-                "error_message": "Workflow aborted by client",
-                "current_step": "failed"
-            }
-        # Events are streamed as nodes complete
-        pass
+    _print_header("STARTING EU CALL FINDER WORKFLOW")
 
-    # Get final state
-    final_state = app.get_state(config)
+    quiet = _quiet()
 
-    print("\n" + "=" * 70)
-    print("WORKFLOW COMPLETED")
-    print("=" * 70)
-    print(f"Status: {final_state.values.get('workflow_status')}")
-    print(f"Total calls found: {len(final_state.values.get('analyzed_calls', []))}")
+    if quiet and abort_event is None:
+        # Nothing to render or check between nodes
+        final_values = app.invoke(initial_state, config)
+    else:
+        final_values = {}
+        for mode, chunk in app.stream(
+            initial_state, config, stream_mode=["updates", "values"]
+        ):
+            if mode == "values":
+                # Full state after each step; the last one is the final state
+                final_values = chunk
+                continue
+            if not quiet:
+                # Updates are streamed as nodes complete
+                for node, update in chunk.items():
+                    _render_update(node, update)
+            if abort_event and abort_event.is_set():
+                print("\n[API] Workflow aborted by client")
+                return {
+                    "workflow_status": "failed",
+                    "error_message": "Workflow aborted by client",
+                    "current_step": "failed"
+                }
+
+    _print_header("WORKFLOW COMPLETED")
+    print(f"Status: {final_values.get('workflow_status')}")
+    print(f"Total calls found: {len(final_values.get('analyzed_calls', []))}")
 
-    if final_state.values.get("error_message"):
-        print(f"Error: {final_state.values['error_message']}")
+    if final_values.get("error_message"):
+        print(f"Error: {final_values['error_message']}")
 
     # Remove non-serializable objects before returning
-    result_values = dict(final_state.values)
+    result_values = dict(final_values)
     result_values.pop("abort_event", None)
 
     return result_values
 
 
 def get_workflow_graph():
-    """Get the workflow graph structure for visualization."""
-    workflow = create_workflow()
-    return workflow
+    """
+    Get the workflow graph structure for visualization.
+    This is the graph shared by every compiled app; build a new one with
+    create_workflow() to modify it.
+    """
+    return _workflow_definition()
 
 
 # ==================== MAIN ====================
@@ -998,9 +1513,5 @@ if __name__ == "__main__":
 
     # Print final report
     if result.get("final_report"):
-        print("\n" + "=" * 70)
-        print("FINAL REPORT")
-        print("=" * 70)
-        import json
-
-        print(json.dumps(result["final_report"], indent=2, default=str))
+        _print_header("FINAL REPORT")
+        print(_report_json(result["final_report"]).decode("utf-8"))
@@ -3,6 +3,18 @@ Planning module for EU Call Finder.
 Creates execution plans from company profiles.
 """
 
-from .smart_planner import SmartPlanner, create_smart_plan, STATIC_FILTER_CONFIG
+from .smart_planner import (
+    SmartPlanner,
+    create_smart_plan,
+    create_smart_plans,
+    get_smart_planner,
+    STATIC_FILTER_CONFIG,
+)
 
-__all__ = ["SmartPlanner", "create_smart_plan", "STATIC_FILTER_CONFIG"]
+__all__ = [
+    "SmartPlanner",
+    "create_smart_plan",
+    "create_smart_plans",
+    "get_smart_planner",
+    "STATIC_FILTER_CONFIG",
+]
@@ -6,9 +6,23 @@ Maintains compatibility with existing scraper while providing deeper analysis.
 import re
 import json
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
 from collections import Counter
 
+try:
+    import ahocorasick
+except ImportError:
+    # Optional: without pyahocorasick, each pattern is searched for separately
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used when missing
+    orjson = None
+
 # HARDCODED filter configuration for EU Funding Portal API compatibility
 STATIC_FILTER_CONFIG = {
     "bool": {
@@ -20,6 +34,303 @@ STATIC_FILTER_CONFIG = {
     }
 }
 
+# Technologies detected in descriptions, with synonyms (also used as keywords)
+_TECH_PATTERNS = {
+    "artificial intelligence": [
+        "AI",
+        "machine learning",
+        "deep learning",
+        "neural networks",
+        "NLP",
+    ],
+    "computer vision": [
+        "image recognition",
+        "medical imaging",
+        "visual analytics",
+    ],
+    "data analytics": ["big data", "predictive analytics", "data mining"],
+    "cloud computing": ["cloud", "SaaS", "distributed systems"],
+    "cybersecurity": ["security", "encryption", "threat detection"],
+    "robotics": ["automation", "robotics", "autonomous systems"],
+    "biotechnology": ["biotech", "genomics", "molecular biology"],
+    "blockchain": ["blockchain", "distributed ledger", "Web3"],
+    "IoT": ["internet of things", "sensors", "connected devices"],
+    "quantum": ["quantum computing", "quantum algorithms"],
+}
+
+# Application areas detected in descriptions
+_APP_AREAS = {
+    "healthcare": [
+        "medical",
+        "clinical",
+        "patient",
+        "diagnostics",
+        "therapeutics",
+        "pharma",
+    ],
+    "education": ["learning", "training", "education", "e-learning"],
+    "transport": ["mobility", "logistics", "transport", "automotive"],
+    "agriculture": ["farming", "agriculture", "agritech", "food"],
+    "manufacturing": ["industry", "factory", "production", " Industry 4.0"],
+    "finance": ["fintech", "banking", "insurance", "financial"],
+    "energy": ["renewable", "solar", "wind", "smart grid", "clean energy"],
+    "environment": ["climate", "sustainability", "carbon", "green"],
+    "security": ["defense", "security", "safety", "protection"],
+    "space": ["space", "satellite", "aerospace"],
+}
+
+
+# Technology Readiness Level signalled by description phrases
+_TRL_INDICATORS = {
+    9: ["commercial", "market ready", "deployed", "operational"],
+    8: ["pilot", "demonstration", "field tested"],
+    7: ["prototype", "system prototype", "integration"],
+    6: ["validation", "model", "simulation"],
+    5: ["laboratory", "component"],
+    4: ["proof of concept", "proof-of-concept", "poc"],
+    3: ["experimental", "proof of principle"],
+    2: ["concept", "formulation", "design"],
+    1: ["basic research", "fundamental"],
+}
+
+
+def _build_category_automaton():
+    """
+    Aho-Corasick automaton over all technology, application and TRL patterns,
+    mapping each pattern to the ("tech" | "app" | "trl", label) categories it
+    signals, so one pass over a description finds every category. None
+    without pyahocorasick.
+    """
+    if ahocorasick is None:
+        return None
+
+    categories: Dict[str, set] = {}
+    for tech, synonyms in _TECH_PATTERNS.items():
+        for word in [tech] + synonyms:
+            categories.setdefault(word, set()).add(("tech", tech))
+    for app, keywords in _APP_AREAS.items():
+        for word in keywords:
+            categories.setdefault(word, set()).add(("app", app))
+    for trl, indicators in _TRL_INDICATORS.items():
+        for word in indicators:
+            categories.setdefault(word, set()).add(("trl", trl))
+
+    automaton = ahocorasick.Automaton()
+    for word, word_categories in categories.items():
+        automaton.add_word(word, frozenset(word_categories))
+    automaton.make_automaton()
+    return automaton
+
+
+_CATEGORY_AUTOMATON = _build_category_automaton()
+
+
+def _matched_categories(description: str) -> set:
+    """("tech" | "app" | "trl", label) categories with a pattern occurring in description."""
+    if _CATEGORY_AUTOMATON is None:
+        matched = {
+            ("tech", tech)
+            for tech, synonyms in _TECH_PATTERNS.items()
+            if tech in description or any(word in description for word in synonyms)
+        }
+        matched.update(
+            ("app", app)
+            for app, keywords in _APP_AREAS.items()
+            if any(word in description for word in keywords)
+        )
+        matched.update(
+            ("trl", trl)
+            for trl, indicators in _TRL_INDICATORS.items()
+            if any(word in description for word in indicators)
+        )
+        return matched
+
+    matched = set()
+    for _, word_categories in _CATEGORY_AUTOMATON.iter(description):
+        matched |= word_categories
+    return matched
+
+
+# Technologies and application areas that point to each EU program
+_HORIZON_TECHS = frozenset(
+    ["artificial intelligence", "biotechnology", "quantum", "robotics"]
+)
+_DIGITAL_TECHS = frozenset(
+    ["artificial intelligence", "cybersecurity", "cloud computing", "data analytics"]
+)
+_HEALTH_TECHS = frozenset(["biotechnology", "medical imaging"])
+_LIFE_TECHS = frozenset(["renewable energy", "clean tech"])
+_CREATIVE_APPS = frozenset(["culture", "media", "creative"])
+
+# Funding budget by company size: companies with fewer employees than the
+# n-th threshold get the n-th range, larger ones the last
+_EMPLOYEE_THRESHOLDS = (10, 50, 250)
+_BUDGET_RANGES = (
+    {"min": 50000, "max": 300000, "typical": 150000},
+    {"min": 100000, "max": 1000000, "typical": 500000},
+    {"min": 500000, "max": 5000000, "typical": 2000000},
+    {"min": 1000000, "max": 10000000, "typical": 5000000},
+)
+
+# Candidate keywords: words of 4+ letters
+_KEYWORD_WORD_RE = re.compile(r"\b[a-zA-Z]{4,}\b")
+
+# Words never used as extracted keywords
+_STOP_WORDS = frozenset(
+    {
+        "the",
+        "and",
+        "for",
+        "are",
+        "with",
+        "they",
+        "this",
+        "that",
+        "have",
+        "from",
+        "been",
+        "were",
+        "said",
+        "each",
+        "which",
+        "will",
+        "about",
+        "could",
+        "would",
+        "their",
+        "there",
+        "where",
+    }
+)
+
+# Queries used when an LLM reply contains no usable query
+_FALLBACK_QUERIES = ["artificial intelligence SME"]
+
+# Queries kept from an LLM reply
+MAX_QUERIES = 6
+
+# Query rules shared by the single and the batched planner system prompts
+_QUERY_RULES = """
+
+CRITICAL RULES FOR QUERIES:
+1. Generate SIMPLE KEYWORD QUERIES - the EU API does NOT support AND/OR operators
+2. Use SPACE-separated keywords, NOT Boolean operators
+3. Wrap multi-word concepts in quotes: "machine learning" healthcare
+4. Keep queries SHORT (max 100 characters)
+5. Each query should be 2-4 key terms maximum
+
+EXAMPLES OF GOOD QUERIES:
+- "machine learning" healthcare
+- "artificial intelligence" Bulgaria
+- "digital health" SME
+- AI "medical imaging"
+- healthcare innovation
+
+BAD QUERIES (uses unsupported AND/OR):
+- "machine learning" AND "healthcare"  <-- AND is NOT supported!
+- "AI" OR "machine learning"          <-- OR is NOT supported!
+- ("AI" OR "ML") AND "healthcare"     <-- Parentheses NOT supported!
+
+The API uses the query_data for filtering, text should be simple keywords only.
+"""
+
+_QUERY_FORMAT = """
+Generate 5-6 simple keyword queries (space-separated, max 100 chars) in this format:
+QUERY 1: "machine learning" healthcare
+QUERY 2: "artificial intelligence" SME
+QUERY 3: "digital health" Bulgaria
+QUERY 4: AI "medical devices"
+QUERY 5: healthcare innovation
+QUERY 6: "clinical decision support"
+"""
+
+_BATCH_QUERY_FORMAT = """
+Generate 5-6 simple keyword queries (space-separated, max 100 chars) for EACH company.
+Start each company's queries with a line holding only its header, in this format:
+COMPANY 1
+QUERY 1: "machine learning" healthcare
+QUERY 2: "artificial intelligence" SME
+...
+COMPANY 2
+QUERY 1: "digital health" Bulgaria
+...
+"""
+
+# System messages carry all static instructions, so every planner request
+# starts with the same prefix and providers can cache it
+_SYSTEM_PROMPT = "You are an expert EU funding search strategist. Generate precise Boolean search queries."
+_QUERY_SYSTEM_PROMPT = _SYSTEM_PROMPT + _QUERY_RULES + _QUERY_FORMAT
+_BATCH_QUERY_SYSTEM_PROMPT = _SYSTEM_PROMPT + _QUERY_RULES + _BATCH_QUERY_FORMAT
+
+
+# One line of an LLM reply, after leading whitespace and any "QUERY X:" label
+# or list number (trailing whitespace is left for the caller to strip)
+_QUERY_LINE_RE = re.compile(
+    r"^[^\S\n]*(?:(?:QUERY \d+:|\d+\.)[^\S\n]*)?(.*)", re.MULTILINE
+)
+
+# Boolean operators and grouping removed from queries (the EU search API
+# takes plain terms); plans also drop lowercase operators
+_AND_RE = re.compile(r"\s+AND\s+")
+_OR_RE = re.compile(r"\s+OR\s+")
+_AND_ANY_CASE_RE = re.compile(r"\s+AND\s+", re.IGNORECASE)
+_OR_ANY_CASE_RE = re.compile(r"\s+OR\s+", re.IGNORECASE)
+_PARENS_RE = re.compile(r"[()]")
+
+# A quoted phrase or a single word of a search query
+_QUERY_TERM_RE = re.compile(r'"[^"]*"|\S+')
+
+
+def _dedupe_queries(queries: List[str]) -> List[str]:
+    """
+    Drop queries with the same terms as an earlier one, ignoring case, spacing
+    and term order. The first spelling is kept.
+    """
+    unique = {}
+    for query in queries:
+        terms = frozenset(_QUERY_TERM_RE.findall(query.lower()))
+        unique.setdefault(terms, query)
+    return list(unique.values())
+
+
+def _dump_indented(data: Any) -> str:
+    """Indented JSON for a prompt, with orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str).decode()
+        except TypeError:
+            # Non-string keys or integers beyond 64 bits; stdlib json handles those
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+
+# Analysis fields left out of the returned plan: the raw input (already in the
+# workflow state) and its prompt serialization
+_PLAN_OMITTED_FIELDS = frozenset(["raw_company_data", "_raw_json"])
+
+
+def _profile_section(analysis: Dict) -> str:
+    """Prompt section with the raw company input and the extracted analysis."""
+    # Raw company data - includes ALL fields from the original input. Serialized
+    # once per analysis, so a batch fallback prompt reuses the batch's dump.
+    raw_json = analysis.get("_raw_json")
+    if raw_json is None:
+        raw_company = analysis.get("raw_company_data", {})
+        raw_json = _dump_indented(raw_company)
+        analysis["_raw_json"] = raw_json
+
+    return f"""=== COMPLETE COMPANY INPUT (ALL DATA) ===
+{raw_json}
+
+=== EXTRACTED ANALYSIS ===
+- Technologies: {", ".join(analysis.get("technologies", []))}
+- Applications: {", ".join(analysis.get("applications", []))}
+- Target EU Programs: {", ".join(analysis.get("eu_programs", []))}
+- TRL Level: {analysis.get("trl_level")}
+- Budget Range: {analysis.get("budget_range", {})}
+- Keywords: {", ".join(analysis.get("keywords", []))}
+"""
+
 
 class SmartPlanner:
     """
@@ -31,6 +342,25 @@ class SmartPlanner:
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
         self.openai_base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        # Created on first LLM call and reused, so repeated plans share connections
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self):
+        """Return the OpenAI client, creating it on first use."""
+        with self._client_lock:
+            if self._client is None:
+                import openai
+
+                # The SDK retries rate limits, 5xx and timeouts with backoff;
+                # only what still fails afterwards falls back to rule-based
+                self._client = openai.OpenAI(
+                    api_key=self.openai_api_key,
+                    base_url=self.openai_base_url,
+                    timeout=float(os.getenv("PLANNER_LLM_TIMEOUT", "30")),
+                    max_retries=int(os.getenv("PLANNER_LLM_MAX_RETRIES", "2")),
+                )
+            return self._client
 
     def analyze_company_deep(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -69,58 +399,17 @@ class SmartPlanner:
             "raw_company_data": company,  # Include complete raw data
         }
 
-        # Extract core technologies from description
-        tech_patterns = {
-            "artificial intelligence": [
-                "AI",
-                "machine learning",
-                "deep learning",
-                "neural networks",
-                "NLP",
-            ],
-            "computer vision": [
-                "image recognition",
-                "medical imaging",
-                "visual analytics",
-            ],
-            "data analytics": ["big data", "predictive analytics", "data mining"],
-            "cloud computing": ["cloud", "SaaS", "distributed systems"],
-            "cybersecurity": ["security", "encryption", "threat detection"],
-            "robotics": ["automation", "robotics", "autonomous systems"],
-            "biotechnology": ["biotech", "genomics", "molecular biology"],
-            "blockchain": ["blockchain", "distributed ledger", "Web3"],
-            "IoT": ["internet of things", "sensors", "connected devices"],
-            "quantum": ["quantum computing", "quantum algorithms"],
-        }
+        matched = _matched_categories(description)
 
-        for tech, synonyms in tech_patterns.items():
-            if any(word in description for word in [tech] + synonyms):
+        # Extract core technologies from description
+        for tech, synonyms in _TECH_PATTERNS.items():
+            if ("tech", tech) in matched:
                 analysis["technologies"].append(tech)
                 analysis["keywords"].extend(synonyms[:2])
 
         # Extract application domains
-        app_areas = {
-            "healthcare": [
-                "medical",
-                "clinical",
-                "patient",
-                "diagnostics",
-                "therapeutics",
-                "pharma",
-            ],
-            "education": ["learning", "training", "education", "e-learning"],
-            "transport": ["mobility", "logistics", "transport", "automotive"],
-            "agriculture": ["farming", "agriculture", "agritech", "food"],
-            "manufacturing": ["industry", "factory", "production", " Industry 4.0"],
-            "finance": ["fintech", "banking", "insurance", "financial"],
-            "energy": ["renewable", "solar", "wind", "smart grid", "clean energy"],
-            "environment": ["climate", "sustainability", "carbon", "green"],
-            "security": ["defense", "security", "safety", "protection"],
-            "space": ["space", "satellite", "aerospace"],
-        }
-
-        for app, keywords in app_areas.items():
-            if any(word in description for word in keywords):
+        for app in _APP_AREAS:
+            if ("app", app) in matched:
                 analysis["applications"].append(app)
 
         # Extract from domains structure
@@ -144,7 +433,7 @@ class SmartPlanner:
         analysis["keywords"] = self._extract_keywords(description, analysis["keywords"])
 
         # Estimate TRL level based on description
-        analysis["trl_level"] = self._estimate_trl(description)
+        analysis["trl_level"] = self._estimate_trl(description, matched)
 
         # Estimate budget needs
         analysis["budget_range"] = self._estimate_budget(company)
@@ -158,35 +447,19 @@ class SmartPlanner:
         apps = set(analysis.get("applications", []))
 
         # Horizon Europe - Research & Innovation
-        if any(
-            t in techs
-            for t in ["artificial intelligence", "biotechnology", "quantum", "robotics"]
-        ):
+        if not techs.isdisjoint(_HORIZON_TECHS):
             programs.append("Horizon Europe")
 
         # Digital Europe - Digital technologies
-        if any(
-            t in techs
-            for t in [
-                "artificial intelligence",
-                "cybersecurity",
-                "cloud computing",
-                "data analytics",
-            ]
-        ):
+        if not techs.isdisjoint(_DIGITAL_TECHS):
             programs.append("Digital Europe")
 
         # EU4Health - Health
-        if "healthcare" in apps or any(
-            t in techs for t in ["biotechnology", "medical imaging"]
-        ):
+        if "healthcare" in apps or not techs.isdisjoint(_HEALTH_TECHS):
             programs.append("EU4Health")
 
         # LIFE Programme - Environment
-        if (
-            any(t in techs for t in ["renewable energy", "clean tech"])
-            or "environment" in apps
-        ):
+        if not techs.isdisjoint(_LIFE_TECHS) or "environment" in apps:
             programs.append("LIFE Programme")
 
         # EIC Accelerator - SME innovation
@@ -194,7 +467,7 @@ class SmartPlanner:
             programs.append("EIC Accelerator")
 
         # Creative Europe - Cultural/creative
-        if any(app in apps for app in ["culture", "media", "creative"]):
+        if not apps.isdisjoint(_CREATIVE_APPS):
             programs.append("Creative Europe")
 
         # Erasmus+ - Education
@@ -205,138 +478,147 @@ class SmartPlanner:
 
     def _extract_keywords(self, description: str, existing: List[str]) -> List[str]:
         """Extract important keywords from description."""
-        # Common stop words
-        stop_words = {
-            "the",
-            "and",
-            "for",
-            "are",
-            "with",
-            "they",
-            "this",
-            "that",
-            "have",
-            "from",
-            "been",
-            "were",
-            "said",
-            "each",
-            "which",
-            "will",
-            "about",
-            "could",
-            "would",
-            "their",
-            "there",
-            "where",
-        }
-
         # Extract meaningful words (4+ chars)
-        words = re.findall(r"\b[a-zA-Z]{4,}\b", description.lower())
-        words = [w for w in words if w not in stop_words and w not in existing]
+        existing_set = set(existing)
+        word_counts = Counter(
+            w
+            for w in _KEYWORD_WORD_RE.findall(description.lower())
+            if w not in _STOP_WORDS and w not in existing_set
+        )
 
         # Get most frequent words
-        word_counts = Counter(words)
-        top_words = [word for word, count in word_counts.most_common(8) if count >= 1]
-
-        # Combine with existing, remove duplicates
-        all_keywords = list(dict.fromkeys(existing + top_words))
-        return all_keywords[:15]  # Limit to 15 keywords
-
-    def _estimate_trl(self, description: str) -> int:
-        """Estimate Technology Readiness Level from description."""
-        trl_indicators = {
-            9: ["commercial", "market ready", "deployed", "operational"],
-            8: ["pilot", "demonstration", "field tested"],
-            7: ["prototype", "system prototype", "integration"],
-            6: ["validation", "model", "simulation"],
-            5: ["laboratory", "component"],
-            4: ["proof of concept", "proof-of-concept", "poc"],
-            3: ["experimental", "proof of principle"],
-            2: ["concept", "formulation", "design"],
-            1: ["basic research", "fundamental"],
-        }
+        top_words = [word for word, _ in word_counts.most_common(8)]
 
-        desc_lower = description.lower()
-        for trl, indicators in sorted(trl_indicators.items(), reverse=True):
-            if any(ind in desc_lower for ind in indicators):
-                return trl
-        return 5  # Default TRL
+        # Combine with existing, remove duplicates, stop at 15 keywords
+        all_keywords = []
+        seen = set()
+        for keyword in (*existing, *top_words):
+            if keyword not in seen:
+                seen.add(keyword)
+                all_keywords.append(keyword)
+                if len(all_keywords) == 15:
+                    break
+        return all_keywords
+
+    def _estimate_trl(self, description: str, matched: set = None) -> int:
+        """
+        Estimate Technology Readiness Level from description.
+        matched can pass the _matched_categories() of the lowercased
+        description when they are already known.
+        """
+        if matched is None:
+            matched = _matched_categories(description.lower())
+        levels = [label for kind, label in matched if kind == "trl"]
+        return max(levels) if levels else 5  # Default TRL
 
     def _estimate_budget(self, company: Dict) -> Dict[str, int]:
         """Estimate funding budget based on company size and type."""
-        employees = company.get("employees", 10)
-
-        if employees < 10:
-            return {"min": 50000, "max": 300000, "typical": 150000}
-        elif employees < 50:
-            return {"min": 100000, "max": 1000000, "typical": 500000}
-        elif employees < 250:
-            return {"min": 500000, "max": 5000000, "typical": 2000000}
-        else:
-            return {"min": 1000000, "max": 10000000, "typical": 5000000}
+        employees = company.get("employees")
+        if employees is None:
+            employees = 10
+
+        # Copied so callers can't change the shared table
+        return dict(_BUDGET_RANGES[bisect_right(_EMPLOYEE_THRESHOLDS, employees)])
 
     def generate_queries_with_llm(
         self, analysis: Dict, previous_feedback: str = None
     ) -> List[str]:
         """Use LLM to generate smart search queries based on deep analysis."""
+        return self._generate_queries(analysis, previous_feedback)[0]
+
+    def _generate_queries(
+        self, analysis: Dict, previous_feedback: str = None
+    ) -> Tuple[List[str], bool]:
+        """
+        Generate the search queries, with the LLM if possible.
+
+        Returns:
+            (queries, True if the LLM wrote them; False for the rule-based
+            or default fallback)
+        """
         if not self.openai_api_key:
             # Fallback to rule-based if no LLM
-            return self._generate_rule_based_queries(analysis, previous_feedback)
+            return self._generate_rule_based_queries(analysis, previous_feedback), False
 
         try:
-            import openai
-
-            client = openai.OpenAI(
-                api_key=self.openai_api_key, base_url=self.openai_base_url
-            )
+            client = self._get_client()
 
             # Build comprehensive prompt
             prompt = self._build_llm_prompt(analysis, previous_feedback)
 
-            response = client.chat.completions.create(
+            stream = client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert EU funding search strategist. Generate precise Boolean search queries.",
-                    },
+                    {"role": "system", "content": _QUERY_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.3,
                 max_tokens=1000,
+                stream=True,
             )
 
-            content = response.choices[0].message.content
+            content = self._read_query_stream(stream)
             if not content:
                 print("[WARNING] LLM returned empty content, using fallback")
-                return self._generate_rule_based_queries(analysis, previous_feedback)
-            return self._parse_llm_queries(content)
+                return (
+                    self._generate_rule_based_queries(analysis, previous_feedback),
+                    False,
+                )
+            queries = self._parse_llm_queries(content)
+            return queries, queries != _FALLBACK_QUERIES
 
         except Exception as e:
             print(f"[WARNING] LLM query generation failed: {e}")
-            return self._generate_rule_based_queries(analysis, previous_feedback)
+            return self._generate_rule_based_queries(analysis, previous_feedback), False
 
-    def _build_llm_prompt(self, analysis: Dict, previous_feedback: str = None) -> str:
-        """Build comprehensive prompt for LLM including ALL company data and feedback."""
-        import json
+    def generate_queries_batch(self, analyses: List[Dict]) -> List[List[str]]:
+        """
+        Generate the search queries of several companies with one LLM call.
 
-        # Get raw company data - includes ALL fields from the original input
-        raw_company = analysis.get("raw_company_data", {})
+        Companies missing from the reply (or all of them, if the call fails)
+        get their queries from generate_queries_with_llm.
 
-        prompt = f"""Based on this complete company profile, generate 5-6 targeted Boolean search queries for EU funding calls.
+        Args:
+            analyses: Results of analyze_company_deep, one per company
 
-=== COMPLETE COMPANY INPUT (ALL DATA) ===
-{json.dumps(raw_company, indent=2, default=str)}
+        Returns:
+            Query lists in the order of analyses
+        """
+        if not self.openai_api_key or len(analyses) < 2:
+            return [self.generate_queries_with_llm(analysis) for analysis in analyses]
 
-=== EXTRACTED ANALYSIS ===
-- Technologies: {", ".join(analysis.get("technologies", []))}
-- Applications: {", ".join(analysis.get("applications", []))}
-- Target EU Programs: {", ".join(analysis.get("eu_programs", []))}
-- TRL Level: {analysis.get("trl_level")}
-- Budget Range: {analysis.get("budget_range", {})}
-- Keywords: {", ".join(analysis.get("keywords", []))}
-"""
+        queries_by_index: Dict[int, List[str]] = {}
+        try:
+            response = self._get_client().chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": _BATCH_QUERY_SYSTEM_PROMPT},
+                    {"role": "user", "content": self._build_batch_prompt(analyses)},
+                ],
+                temperature=0.3,
+                max_tokens=1000 * len(analyses),
+            )
+            queries_by_index = self._parse_batch_queries(
+                response.choices[0].message.content
+            )
+        except Exception as e:
+            print(f"[WARNING] Batched LLM query generation failed: {e}")
+
+        results = []
+        for i, analysis in enumerate(analyses, 1):
+            queries = queries_by_index.get(i)
+            if not queries:
+                print(f"[WARNING] No batched queries for company {i}, planning it alone")
+                queries = self.generate_queries_with_llm(analysis)
+            results.append(queries)
+        return results
+
+    def _build_llm_prompt(self, analysis: Dict, previous_feedback: str = None) -> str:
+        """Build comprehensive prompt for LLM including ALL company data and feedback."""
+        prompt = (
+            "Based on this complete company profile, generate 5-6 targeted Boolean "
+            "search queries for EU funding calls.\n\n" + _profile_section(analysis)
+        )
 
         if previous_feedback:
             prompt += f"""
@@ -350,42 +632,22 @@ You are in an iterative refinement process. The feedback above represents the cu
 - Address ALL points mentioned in the feedback
 - Generate queries that are more targeted and specific based on the feedback
 - If feedback mentions specific domains, technologies, or requirements, prioritize those
-"""
-
-        prompt += """
-
-CRITICAL RULES FOR QUERIES:
-1. Generate SIMPLE KEYWORD QUERIES - the EU API does NOT support AND/OR operators
-2. Use SPACE-separated keywords, NOT Boolean operators
-3. Wrap multi-word concepts in quotes: "machine learning" healthcare
-4. Keep queries SHORT (max 100 characters)
-5. Each query should be 2-4 key terms maximum
-
-EXAMPLES OF GOOD QUERIES:
-- "machine learning" healthcare
-- "artificial intelligence" Bulgaria
-- "digital health" SME
-- AI "medical imaging"
-- healthcare innovation
-
-BAD QUERIES (uses unsupported AND/OR):
-- "machine learning" AND "healthcare"  <-- AND is NOT supported!
-- "AI" OR "machine learning"          <-- OR is NOT supported!
-- ("AI" OR "ML") AND "healthcare"     <-- Parentheses NOT supported!
-
-The API uses the query_data for filtering, text should be simple keywords only.
-
-Generate 5-6 simple keyword queries (space-separated, max 100 chars) in this format:
-QUERY 1: "machine learning" healthcare
-QUERY 2: "artificial intelligence" SME
-QUERY 3: "digital health" Bulgaria
-QUERY 4: AI "medical devices"
-QUERY 5: healthcare innovation
-QUERY 6: "clinical decision support"
 """
 
         return prompt
 
+    def _build_batch_prompt(self, analyses: List[Dict]) -> str:
+        """Build one prompt asking for the queries of several companies."""
+        sections = [
+            f"##### COMPANY {i} #####\n{_profile_section(analysis)}"
+            for i, analysis in enumerate(analyses, 1)
+        ]
+        return (
+            f"Based on these {len(analyses)} company profiles, generate 5-6 targeted "
+            "search queries for EU funding calls for EACH company.\n\n"
+            + "\n".join(sections)
+        )
+
     def _parse_llm_queries(self, content: str) -> List[str]:
         """Parse queries from LLM response and enforce length limits."""
         queries = []
@@ -396,11 +658,9 @@ QUERY 6: "clinical decision support"
             return queries
 
         # Look for patterns like "QUERY X:" or numbered lists
-        lines = content.strip().split("\n")
-        for line in lines:
-            # Remove numbering and labels
-            cleaned = re.sub(r"^(QUERY \d+:|\d+\.)\s*", "", line.strip())
-            if cleaned and len(cleaned) > 10:
+        for match in _QUERY_LINE_RE.finditer(content):
+            cleaned = match.group(1).rstrip()
+            if len(cleaned) > 10:
                 # Truncate if too long
                 if len(cleaned) > MAX_QUERY_LENGTH:
                     print(
@@ -417,9 +677,9 @@ QUERY 6: "clinical decision support"
         cleaned_queries = []
         for q in queries:
             # Remove AND/OR operators
-            q = re.sub(r"\s+AND\s+", " ", q)
-            q = re.sub(r"\s+OR\s+", " ", q)
-            q = re.sub(r"[()]", "", q)  # Remove parentheses
+            q = _AND_RE.sub(" ", q)
+            q = _OR_RE.sub(" ", q)
+            q = _PARENS_RE.sub("", q)  # Remove parentheses
             q = q.strip()
             if len(q) > MAX_QUERY_LENGTH:
                 q = q[:MAX_QUERY_LENGTH].rsplit(" ", 1)[
@@ -430,9 +690,43 @@ QUERY 6: "clinical decision support"
 
         # Default fallback
         if not cleaned_queries:
-            return ["artificial intelligence SME"]
+            return list(_FALLBACK_QUERIES)
 
-        return cleaned_queries[:6]
+        return cleaned_queries[:MAX_QUERIES]
+
+    def _read_query_stream(self, stream) -> str:
+        """
+        Read a streamed completion until it holds as many complete query
+        lines as _parse_llm_queries keeps, then close the stream instead of
+        waiting for any trailing explanation.
+        """
+        content = ""
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                content += delta
+                if "\n" in delta:
+                    complete_lines = content[: content.rfind("\n")]
+                    if len(self._parse_llm_queries(complete_lines)) >= MAX_QUERIES:
+                        break
+        finally:
+            stream.close()
+        return content
+
+    def _parse_batch_queries(self, content: str) -> Dict[int, List[str]]:
+        """Parse a batched reply into query lists keyed by company number."""
+        queries_by_index = {}
+        if not content:
+            return queries_by_index
+
+        # ["", "1", "<queries of company 1>", "2", ...]
+        parts = re.split(r"^\s*COMPANY (\d+)\s*$", content, flags=re.MULTILINE)
+        for index, block in zip(parts[1::2], parts[2::2]):
+            if re.search(r"QUERY \d+:", block):
+                queries_by_index[int(index)] = self._parse_llm_queries(block)
+        return queries_by_index
 
     def _generate_rule_based_queries(
         self, analysis: Dict, previous_feedback: str = None
@@ -448,7 +742,7 @@ QUERY 6: "clinical decision support"
         name = analysis.get("name", "")
         company_type = analysis.get("type", "SME")
         country = analysis.get("country", "")
-        employees = analysis.get("employees", 10)
+        employees = analysis.get("employees") or 10
         competencies = analysis.get("competencies", [])
 
         # Strategy 1: Primary Technology + Application (most specific)
@@ -511,25 +805,19 @@ QUERY 6: "clinical decision support"
             queries = self._refine_queries(queries, previous_feedback, analysis)
 
         # Ensure minimum queries with fallback
-        while len(queries) < 3:
+        if len(queries) < 3:
             if techs and apps:
-                queries.append(f'"{techs[0]}" {apps[0]}')
+                fallback = f'"{techs[0]}" {apps[0]}'
             elif techs:
-                queries.append(f'"{techs[0]}" innovation')
+                fallback = f'"{techs[0]}" innovation'
             elif apps:
-                queries.append(f"{apps[0]} technology")
+                fallback = f"{apps[0]} technology"
             else:
-                queries.append(f"{company_type} innovation")
+                fallback = f"{company_type} innovation"
+            queries.extend([fallback] * (3 - len(queries)))
 
         # Remove duplicates while preserving order
-        seen = set()
-        unique_queries = []
-        for q in queries:
-            if q not in seen:
-                seen.add(q)
-                unique_queries.append(q)
-
-        return unique_queries[:6]
+        return list(dict.fromkeys(queries))[:6]
 
     def _refine_queries(
         self, queries: List[str], feedback: str, analysis: Dict
@@ -583,23 +871,67 @@ QUERY 6: "clinical decision support"
         if previous_feedback:
             print(f"   [REFINING] Applying feedback: {previous_feedback[:60]}...")
 
-        queries = self.generate_queries_with_llm(analysis, previous_feedback)
+        queries, from_llm = self._generate_queries(analysis, previous_feedback)
 
-        # Final cleanup: Remove any remaining AND/OR operators from all queries
-        import re
+        return self._build_plan(analysis, queries, previous_feedback, from_llm)
 
+    def create_plans(
+        self, companies: List[Dict[str, Any]], batch_size: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create first plans for several companies, generating the queries of
+        up to batch_size companies per LLM call.
+
+        Args:
+            companies: Company inputs, as given to create_plan
+            batch_size: Companies per LLM call (default PLANNER_BATCH_SIZE or 5)
+
+        Returns:
+            Plans in the order of companies
+        """
+        if batch_size is None:
+            batch_size = int(os.getenv("PLANNER_BATCH_SIZE", "5"))
+        batch_size = max(1, batch_size)
+
+        print(f"   [ANALYZING] Analyzing {len(companies)} company profiles...")
+        analyses = [self.analyze_company_deep(company) for company in companies]
+
+        plans = []
+        for start in range(0, len(analyses), batch_size):
+            batch = analyses[start : start + batch_size]
+            print(
+                f"   [GENERATING] Creating search queries for companies "
+                f"{start + 1}-{start + len(batch)}..."
+            )
+            for analysis, queries in zip(batch, self.generate_queries_batch(batch)):
+                plans.append(self._build_plan(analysis, queries))
+        return plans
+
+    def _build_plan(
+        self,
+        analysis: Dict,
+        queries: List[str],
+        previous_feedback: str = None,
+        from_llm: bool = None,
+    ) -> Dict[str, Any]:
+        """
+        Assemble the plan returned to the workflow from analysis and queries.
+        from_llm is recorded as llm_generated when known, so callers can tell
+        LLM plans from fallback ones.
+        """
+        # Final cleanup: Remove any remaining AND/OR operators from all queries
         cleaned_queries = []
         for q in queries:
             # Remove AND/OR operators and parentheses
-            q = re.sub(r"\s+AND\s+", " ", q, flags=re.IGNORECASE)
-            q = re.sub(r"\s+OR\s+", " ", q, flags=re.IGNORECASE)
-            q = re.sub(r"[()]", "", q)
+            q = _AND_ANY_CASE_RE.sub(" ", q)
+            q = _OR_ANY_CASE_RE.sub(" ", q)
+            q = _PARENS_RE.sub("", q)
             q = q.strip()
             if len(q) > 10:
                 cleaned_queries.append(q)
-        queries = cleaned_queries
+        queries = _dedupe_queries(cleaned_queries)
 
-        # Step 3: Build plan with same structure as before
+        # Build plan with same structure as before
         plan = {
             "company_name": analysis.get("name", "Unknown"),
             "company_type": analysis.get("type", "SME"),
@@ -608,10 +940,14 @@ QUERY 6: "clinical decision support"
             "target_programs": analysis.get("eu_programs", ["Horizon Europe"]),
             "estimated_calls": min(20, len(queries) * 3),
             "reasoning": self._build_reasoning(analysis, previous_feedback),
-            "analysis": analysis,  # Extra info for debugging
-            "timestamp": __import__("datetime").datetime.now().isoformat(),
+            # Extra info for debugging; the raw input is already in the workflow state
+            "analysis": {
+                k: v for k, v in analysis.items() if k not in _PLAN_OMITTED_FIELDS
+            },
+            "timestamp": datetime.now().isoformat(),
         }
-
+        if from_llm is not None:
+            plan["llm_generated"] = from_llm
         return plan
 
     def _build_reasoning(self, analysis: Dict, previous_feedback: str = None) -> str:
@@ -625,10 +961,30 @@ QUERY 6: "clinical decision support"
             return f"Initial plan targeting: {techs} for {apps} applications. TRL {analysis.get('trl_level', 'unknown')}."
 
 
+_planner: Optional[SmartPlanner] = None
+_planner_lock = threading.Lock()
+
+
+def get_smart_planner() -> SmartPlanner:
+    """Return the shared SmartPlanner, configured from environment variables."""
+    global _planner
+
+    with _planner_lock:
+        if _planner is None:
+            _planner = SmartPlanner()
+        return _planner
+
+
 # Convenience function for backward compatibility
 def create_smart_plan(
     company_data: Dict[str, Any], previous_feedback: str = None
 ) -> Dict[str, Any]:
     """Create plan using smart planner."""
-    planner = SmartPlanner()
-    return planner.create_plan(company_data, previous_feedback)
+    return get_smart_planner().create_plan(company_data, previous_feedback)
+
+
+def create_smart_plans(
+    companies: List[Dict[str, Any]], batch_size: int = None
+) -> List[Dict[str, Any]]:
+    """Create first plans for several companies, batching the LLM calls."""
+    return get_smart_planner().create_plans(companies, batch_size)
@@ -2,6 +2,8 @@ import json
 import os
 import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 import requests
@@ -116,45 +118,66 @@ def scrape_partners(driver: webdriver.Chrome) -> List[Dict[str, str]]:
     return partners
 
 
-def _api_search_topics(
-    search_terms: List[str], query_data: Dict[str, Any]
-) -> List[Dict[str, str]]:
-    """Return unique topics from the EU search API as list of {identifier, title}."""
-    unique_topics_map: Dict[str, Dict[str, str]] = {}
+_DISPLAY_FIELDS_JSON = json.dumps(["identifier", "title"])
 
+
+def _search_term(term: str, files: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Return the topics the EU search API finds for one term, as {identifier, title}."""
     search_url = "https://api.tech.ec.europa.eu/search-api/prod/rest/search"
     headers = {"User-Agent": "Mozilla/5.0"}
+    params = {"apiKey": "SEDIA", "text": term, "pageSize": "50", "pageNumber": "1"}
 
-    for term in search_terms:
-        params = {"apiKey": "SEDIA", "text": term, "pageSize": "50", "pageNumber": "1"}
+    response = requests.post(
+        search_url, params=params, files=files, headers=headers, timeout=30
+    )
+    response.raise_for_status()
+
+    topics: List[Dict[str, str]] = []
+    for item in response.json().get("results", []):
+        meta = item.get("metadata", {})
+        identifiers = meta.get("identifier", [])
+        if identifiers:
+            topics.append(
+                {
+                    "identifier": identifiers[0],
+                    "title": (meta.get("title", [""]) or [""])[0],
+                }
+            )
+    return topics
 
-        files = {
-            "query": ("blob", json.dumps(query_data), "application/json"),
-            "displayFields": (
-                "blob",
-                json.dumps(["identifier", "title"]),
-                "application/json",
-            ),
-        }
 
-        response = requests.post(
-            search_url, params=params, files=files, headers=headers, timeout=30
-        )
-        response.raise_for_status()
-
-        raw_results = response.json().get("results", [])
-        for item in raw_results:
-            meta = item.get("metadata", {})
-            identifiers = meta.get("identifier", [])
-            if identifiers:
-                t_id = identifiers[0]
-                if t_id not in unique_topics_map:
-                    unique_topics_map[t_id] = {
-                        "identifier": t_id,
-                        "title": (meta.get("title", [""]) or [""])[0],
-                    }
+def _api_search_topics(
+    search_terms: List[str], query_data: Dict[str, Any]
+) -> List[Dict[str, str]]:
+    """
+    Return unique topics from the EU search API as list of {identifier, title}.
+
+    All terms are searched concurrently (at most SCRAPER_CONCURRENCY requests
+    at once). Topics found by several terms are kept once, in search term
+    order. A failed term is skipped unless every term fails.
+    """
+    # The query is the same for every term; serialize it once
+    files = {
+        "query": ("blob", json.dumps(query_data), "application/json"),
+        "displayFields": ("blob", _DISPLAY_FIELDS_JSON, "application/json"),
+    }
 
-        time.sleep(1)  # be polite
+    workers = max(1, min(int(os.getenv("SCRAPER_CONCURRENCY", "4")), len(search_terms)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        searches = [pool.submit(_search_term, term, files) for term in search_terms]
+
+    unique_topics_map: Dict[str, Dict[str, str]] = {}
+    errors = []
+    for term, search in zip(search_terms, searches):
+        if search.exception():
+            print(f"   [WARN] Search failed for '{term}': {search.exception()}")
+            errors.append(search.exception())
+            continue
+        for topic in search.result():
+            unique_topics_map.setdefault(topic["identifier"], topic)
+
+    if errors and len(errors) == len(search_terms):
+        raise errors[0]
 
     return list(unique_topics_map.values())
 
@@ -195,249 +218,291 @@ def default_search_query() -> Dict[str, Any]:
     }
 
 
-def scrape_topics_to_json(
-    *,
-    search_terms: Optional[List[str]] = None,
-    search_query: Optional[Dict[str, Any]] = None,
-    headless: bool = DEFAULT_HEADLESS_MODE,
-    max_topics: Optional[int] = None,
-    abort_event: Optional[Any] = None,
-) -> List[Dict[str, Any]]:
-    """Run API search + Selenium scraping and return a simple JSON-serializable list."""
-    search_terms = resolve_search_terms(search_terms)
-    query = search_query or default_search_query()
-
-    topics_to_scrape = _api_search_topics(search_terms, query)
-    if max_topics is not None:
-        topics_to_scrape = topics_to_scrape[: max(0, int(max_topics))]
+def _scrape_topic(driver: webdriver.Chrome, item: Dict[str, str]) -> Dict[str, Any]:
+    """Scrape the detail page of one topic found by the search API."""
+    topic_id = item["identifier"]
+    url = (
+        "https://ec.europa.eu/info/funding-tenders/opportunities/portal/screen/opportunities/topic-details/"
+        f"{topic_id}"
+    )
 
-    driver = _make_driver(headless=headless)
-    final_data: List[Dict[str, Any]] = []
+    driver.get(url)
+    wait = WebDriverWait(driver, 20)
+    wait.until(
+        EC.presence_of_element_located((By.CLASS_NAME, "eui-page-content"))
+    )
 
+    # Remove common overlays
     try:
-        for item in topics_to_scrape:
-            if abort_event and abort_event.is_set():
-                print("\n[SCRAPER] Aborted by client")
-                break
-
-            topic_id = item["identifier"]
-            url = (
-                "https://ec.europa.eu/info/funding-tenders/opportunities/portal/screen/opportunities/topic-details/"
-                f"{topic_id}"
-            )
+        driver.execute_script(
+            "var blockers=document.querySelectorAll('.cck-cookie-banner, .eui-app-header');blockers.forEach(el=>el.remove());"
+        )
+    except Exception:
+        pass
 
-            driver.get(url)
-            wait = WebDriverWait(driver, 20)
-            wait.until(
-                EC.presence_of_element_located((By.CLASS_NAME, "eui-page-content"))
+    # Expand "Show more"
+    time.sleep(1.5)
+    expand_triggers = driver.find_elements(
+        By.XPATH, "//*[contains(text(), 'Show more')]"
+    )
+    for trigger in expand_triggers:
+        try:
+            driver.execute_script(
+                "arguments[0].scrollIntoView({block: 'center'});", trigger
             )
+            time.sleep(0.1)
+            driver.execute_script("arguments[0].click();", trigger)
+            time.sleep(0.1)
+        except Exception:
+            pass
+    time.sleep(1)
 
-            # Remove common overlays
-            try:
-                driver.execute_script(
-                    "var blockers=document.querySelectorAll('.cck-cookie-banner, .eui-app-header');blockers.forEach(el=>el.remove());"
-                )
-            except Exception:
-                pass
+    full_text = driver.find_element(By.TAG_NAME, "body").text
 
-            # Expand "Show more"
-            time.sleep(1.5)
-            expand_triggers = driver.find_elements(
-                By.XPATH, "//*[contains(text(), 'Show more')]"
-            )
-            for trigger in expand_triggers:
+    desc_text = extract_description_smart(full_text)
+    dest_text = extract_section(
+        full_text,
+        "Topic destination",
+        ["Topic conditions and documents", "Budget overview"],
+    )
+    cond_text = extract_section(
+        full_text,
+        "Topic conditions and documents",
+        ["Budget overview", "Partner search"],
+    )
+    budget_text = extract_section(
+        full_text,
+        "Budget overview",
+        [
+            "Partner search announcements",
+            "Start submission",
+            "Topic Q&As",
+            "Get support",
+        ],
+    )
+
+    def get_val(label: str) -> str:
+        match = re.search(
+            rf"{re.escape(label)}\s*\n([^\n]+)", full_text, re.IGNORECASE
+        )
+        return match.group(1).strip() if match else "N/A"
+
+    # Extract specific budget amount for this topic
+    def extract_budget_amount(topic_id: str, budget_text: str) -> str:
+        """Extract the specific budget amount for this topic from the budget table.
+
+        Strategy:
+        - Find the line containing the topic_id
+        - Prefer the first *large* number (>= 10k) near that line (same line or next few)
+        - Avoid years / row numbers (common noise)
+        """
+        if not budget_text or topic_id not in budget_text:
+            return "N/A"
+
+        lines = budget_text.split("\n")
+        for i, line in enumerate(lines):
+            if topic_id not in line:
+                continue
+
+            # Look for numeric candidates in the topic line and a few subsequent lines
+            window = "\n".join(lines[i : min(i + 4, len(lines))])
+            raw_nums = re.findall(r"\d[\d\s,]*\d|\d+", window)
+
+            candidates: list[int] = []
+            for raw in raw_nums:
+                digits = raw.replace(" ", "").replace(",", "")
                 try:
-                    driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center'});", trigger
-                    )
-                    time.sleep(0.1)
-                    driver.execute_script("arguments[0].click();", trigger)
-                    time.sleep(0.1)
+                    n = int(digits)
                 except Exception:
-                    pass
-            time.sleep(1)
+                    continue
 
-            full_text = driver.find_element(By.TAG_NAME, "body").text
+                # Filter out obvious non-budget values (years, indices)
+                if n < 10000:
+                    continue
+                if 1900 <= n <= 2100:
+                    continue
+                candidates.append(n)
 
-            desc_text = extract_description_smart(full_text)
-            dest_text = extract_section(
-                full_text,
-                "Topic destination",
-                ["Topic conditions and documents", "Budget overview"],
-            )
-            cond_text = extract_section(
-                full_text,
-                "Topic conditions and documents",
-                ["Budget overview", "Partner search"],
-            )
-            budget_text = extract_section(
-                full_text,
-                "Budget overview",
-                [
-                    "Partner search announcements",
-                    "Start submission",
-                    "Topic Q&As",
-                    "Get support",
-                ],
-            )
+            if not candidates:
+                return "N/A"
 
-            def get_val(label: str) -> str:
-                match = re.search(
-                    rf"{re.escape(label)}\s*\n([^\n]+)", full_text, re.IGNORECASE
-                )
-                return match.group(1).strip() if match else "N/A"
-
-            # Extract specific budget amount for this topic
-            def extract_budget_amount(topic_id: str, budget_text: str) -> str:
-                """Extract the specific budget amount for this topic from the budget table.
-
-                Strategy:
-                - Find the line containing the topic_id
-                - Prefer the first *large* number (>= 10k) near that line (same line or next few)
-                - Avoid years / row numbers (common noise)
-                """
-                if not budget_text or topic_id not in budget_text:
-                    return "N/A"
+            # Budget is usually the biggest number in that local window
+            num = max(candidates)
+            if num >= 1000000:
+                return f"€{num / 1000000:.1f}M"
+            elif num >= 1000:
+                return f"€{num / 1000:.0f}K"
+            else:
+                return f"€{num}"
 
-                lines = budget_text.split("\n")
-                for i, line in enumerate(lines):
-                    if topic_id not in line:
-                        continue
-
-                    # Look for numeric candidates in the topic line and a few subsequent lines
-                    window = "\n".join(lines[i : min(i + 4, len(lines))])
-                    raw_nums = re.findall(r"\d[\d\s,]*\d|\d+", window)
-
-                    candidates: list[int] = []
-                    for raw in raw_nums:
-                        digits = raw.replace(" ", "").replace(",", "")
-                        try:
-                            n = int(digits)
-                        except Exception:
-                            continue
-
-                        # Filter out obvious non-budget values (years, indices)
-                        if n < 10000:
-                            continue
-                        if 1900 <= n <= 2100:
-                            continue
-                        candidates.append(n)
-
-                    if not candidates:
-                        return "N/A"
-
-                    # Budget is usually the biggest number in that local window
-                    num = max(candidates)
-                    if num >= 1000000:
-                        return f"€{num / 1000000:.1f}M"
-                    elif num >= 1000:
-                        return f"€{num / 1000:.0f}K"
-                    else:
-                        return f"€{num}"
+        return "N/A"
 
-                return "N/A"
+    budget_amount = extract_budget_amount(topic_id, budget_text)
 
-            budget_amount = extract_budget_amount(topic_id, budget_text)
+    def extract_contribution_amount(topic_id: str, budget_text: str) -> str:
+        """Extract indicative per-project contribution for this topic.
 
-            def extract_contribution_amount(topic_id: str, budget_text: str) -> str:
-                """Extract indicative per-project contribution for this topic.
+        The 'Budget overview' section usually contains a 'Contributions' column.
+        We try to capture patterns like:
+        - around 17500000
+        - 4800000 to 5600000
+        - around 4 000 000
+        """
+        if not budget_text or topic_id not in budget_text:
+            return "N/A"
+
+        lines = [ln.strip() for ln in budget_text.split("\n") if ln.strip()]
+        for i, line in enumerate(lines):
+            if topic_id not in line:
+                continue
 
-                The 'Budget overview' section usually contains a 'Contributions' column.
-                We try to capture patterns like:
-                - around 17500000
-                - 4800000 to 5600000
-                - around 4 000 000
-                """
-                if not budget_text or topic_id not in budget_text:
+            window = "\n".join(lines[i : min(i + 8, len(lines))]).lower()
+
+            # Range pattern: "4800000 to 5600000" (spaces allowed)
+            m_range = re.search(r"(\d[\d\s,]{3,})\s*to\s*(\d[\d\s,]{3,})", window)
+            if m_range:
+                a_digits = re.sub(r"\D", "", m_range.group(1))
+                b_digits = re.sub(r"\D", "", m_range.group(2))
+                if not a_digits or not b_digits:
+                    return "N/A"
+                a = int(a_digits)
+                b = int(b_digits)
+                lo, hi = min(a, b), max(a, b)
+                return f"€{lo/1_000_000:.1f}M–€{hi/1_000_000:.1f}M"
+
+            # Around pattern: "around 17500000"
+            m_around = re.search(r"around\s*(\d[\d\s,]{3,})", window)
+            if m_around:
+                n_digits = re.sub(r"\D", "", m_around.group(1))
+                if not n_digits:
                     return "N/A"
+                n = int(n_digits)
+                return f"~€{n/1_000_000:.1f}M" if n >= 1_000_000 else f"~€{n}"
+
+            # Fallback: any big number in the window (>= 100k)
+            nums = [
+                int(re.sub(r"\D", "", x))
+                for x in re.findall(r"\d[\d\s,]{4,}", window)
+                if re.sub(r"\D", "", x)
+            ]
+            nums = [n for n in nums if n >= 100000 and not (1900 <= n <= 2100)]
+            if nums:
+                n = max(nums)
+                return f"€{n/1_000_000:.1f}M" if n >= 1_000_000 else f"€{n}"
 
-                lines = [ln.strip() for ln in budget_text.split("\n") if ln.strip()]
-                for i, line in enumerate(lines):
-                    if topic_id not in line:
-                        continue
-
-                    window = "\n".join(lines[i : min(i + 8, len(lines))]).lower()
-
-                    # Range pattern: "4800000 to 5600000" (spaces allowed)
-                    m_range = re.search(r"(\d[\d\s,]{3,})\s*to\s*(\d[\d\s,]{3,})", window)
-                    if m_range:
-                        a_digits = re.sub(r"\D", "", m_range.group(1))
-                        b_digits = re.sub(r"\D", "", m_range.group(2))
-                        if not a_digits or not b_digits:
-                            return "N/A"
-                        a = int(a_digits)
-                        b = int(b_digits)
-                        lo, hi = min(a, b), max(a, b)
-                        return f"€{lo/1_000_000:.1f}M–€{hi/1_000_000:.1f}M"
-
-                    # Around pattern: "around 17500000"
-                    m_around = re.search(r"around\s*(\d[\d\s,]{3,})", window)
-                    if m_around:
-                        n_digits = re.sub(r"\D", "", m_around.group(1))
-                        if not n_digits:
-                            return "N/A"
-                        n = int(n_digits)
-                        return f"~€{n/1_000_000:.1f}M" if n >= 1_000_000 else f"~€{n}"
-
-                    # Fallback: any big number in the window (>= 100k)
-                    nums = [
-                        int(re.sub(r"\D", "", x))
-                        for x in re.findall(r"\d[\d\s,]{4,}", window)
-                        if re.sub(r"\D", "", x)
-                    ]
-                    nums = [n for n in nums if n >= 100000 and not (1900 <= n <= 2100)]
-                    if nums:
-                        n = max(nums)
-                        return f"€{n/1_000_000:.1f}M" if n >= 1_000_000 else f"€{n}"
+        return "N/A"
 
-                return "N/A"
+    contribution_amount = extract_contribution_amount(topic_id, budget_text)
+
+    partners_data = scrape_partners(driver)
+
+    record: Dict[str, Any] = {
+        "id": topic_id,
+        "title": item.get("title", ""),
+        "url": url,
+        "status": "Forthcoming" if "Forthcoming" in full_text else "Open",
+        "general_info": {
+            "programme": get_val("Programme"),
+            "call": get_val("Call"),
+            "action_type": get_val("Type of action"),
+            "deadline_model": get_val("Deadline model"),
+            "dates": {
+                "opening": get_val("Planned opening date"),
+                "deadline": get_val("Deadline date"),
+            },
+        },
+        "content": {
+            "description": clean_text(desc_text),
+            "destination": clean_text(dest_text),
+            "conditions": clean_text(cond_text),
+            "budget_overview": clean_text(budget_text),
+        },
+        "partners": partners_data,
+        # budget: total indicative topic budget
+        "budget": budget_amount,
+        # contribution: indicative EU contribution per project (when detectable)
+        "contribution": contribution_amount,
+    }
+    return record
 
-            contribution_amount = extract_contribution_amount(topic_id, budget_text)
-
-            partners_data = scrape_partners(driver)
-
-            record: Dict[str, Any] = {
-                "id": topic_id,
-                "title": item.get("title", ""),
-                "url": url,
-                "status": "Forthcoming" if "Forthcoming" in full_text else "Open",
-                "general_info": {
-                    "programme": get_val("Programme"),
-                    "call": get_val("Call"),
-                    "action_type": get_val("Type of action"),
-                    "deadline_model": get_val("Deadline model"),
-                    "dates": {
-                        "opening": get_val("Planned opening date"),
-                        "deadline": get_val("Deadline date"),
-                    },
-                },
-                "content": {
-                    "description": clean_text(desc_text),
-                    "destination": clean_text(dest_text),
-                    "conditions": clean_text(cond_text),
-                    "budget_overview": clean_text(budget_text),
-                },
-                "partners": partners_data,
-                # budget: total indicative topic budget
-                "budget": budget_amount,
-                # contribution: indicative EU contribution per project (when detectable)
-                "contribution": contribution_amount,
-            }
-            final_data.append(record)
-
-    except Exception as e:
-        print(f"\n[SCRAPER] Error during scraping: {e}")
-        import traceback
-        traceback.print_exc()
-        # Return whatever data was collected so far so the workflow can continue
-        pass
-    finally:
+
+def _scrape_details(
+    topics: List[Dict[str, str]],
+    headless: bool,
+    abort_event: Optional[Any] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape the detail pages of topics on a small pool of browsers.
+
+    SCRAPER_CONCURRENCY (default 4) browsers are started, at most one per
+    topic; each takes the next unscraped topic until none are left. After
+    an error or an abort no new pages are started, and the topics scraped
+    so far are returned in search order.
+    """
+    if not topics:
+        return []
+
+    workers = max(1, min(int(os.getenv("SCRAPER_CONCURRENCY", "4")), len(topics)))
+    records: List[Optional[Dict[str, Any]]] = [None] * len(topics)
+    next_index = iter(range(len(topics)))
+    index_lock = threading.Lock()
+    stop = threading.Event()
+
+    def next_topic() -> Optional[int]:
+        with index_lock:
+            if stop.is_set() or (abort_event and abort_event.is_set()):
+                return None
+            return next(next_index, None)
+
+    def run(driver: webdriver.Chrome) -> None:
+        while (index := next_topic()) is not None:
+            try:
+                records[index] = _scrape_topic(driver, topics[index])
+            except Exception as e:
+                stop.set()
+                print(f"\n[SCRAPER] Error during scraping: {e}")
+                import traceback
+                traceback.print_exc()
+                # Return whatever data was collected so far so the workflow can continue
+                return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        started = [pool.submit(_make_driver, headless) for _ in range(workers)]
+        drivers = [future.result() for future in started if not future.exception()]
         try:
-            driver.quit()
-        except:
-            pass
+            if not drivers:
+                # Every browser failed to start
+                raise started[0].exception()
+            list(pool.map(run, drivers))
+        finally:
+            for driver in drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    if abort_event and abort_event.is_set():
+        print("\n[SCRAPER] Aborted by client")
+    return [record for record in records if record is not None]
+
+
+def scrape_topics_to_json(
+    *,
+    search_terms: Optional[List[str]] = None,
+    search_query: Optional[Dict[str, Any]] = None,
+    headless: bool = DEFAULT_HEADLESS_MODE,
+    max_topics: Optional[int] = None,
+    abort_event: Optional[Any] = None,
+) -> List[Dict[str, Any]]:
+    """Run API search + Selenium scraping and return a simple JSON-serializable list."""
+    search_terms = resolve_search_terms(search_terms)
+    query = search_query or default_search_query()
+
+    topics_to_scrape = _api_search_topics(search_terms, query)
+    if max_topics is not None:
+        topics_to_scrape = topics_to_scrape[: max(0, int(max_topics))]
 
-    return final_data
+    return _scrape_details(topics_to_scrape, headless, abort_event)
 
 
 def scrape_topics_node(state: Dict[str, Any], **kwargs) -> Dict[str, Any]:
@@ -5,10 +5,20 @@ API key loaded from environment variables (.env file).
 """
 
 import os
+import re
 import json
+import functools
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used when missing
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers are unchanged
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 # LLM Configuration - API key from environment
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")  # openai, anthropic, etc.
@@ -16,6 +26,10 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4")
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.3"))
 
+# Body of a ```json (or else any ```) code block; an unclosed block runs to the end
+_JSON_FENCE_RE = re.compile(r"```json(.*?)(?:```|\Z)", re.DOTALL)
+_FENCE_RE = re.compile(r"```(.*?)(?:```|\Z)", re.DOTALL)
+
 
 @dataclass
 class LLMResponse:
@@ -47,17 +61,7 @@ def perform_qualitative_analysis(call_data: dict, company_profile: dict) -> dict
         llm_result = call_llm_for_analysis(call_data, company_profile)
 
         # Convert to expected format
-        return {
-            "match_summary": llm_result.match_summary,
-            "domain_matches": llm_result.domain_matches,
-            "keyword_hits": llm_result.keyword_hits,
-            "relevant_past_projects": llm_result.relevant_past_projects,
-            "suggested_partners": llm_result.suggested_partners,
-            "estimated_effort_hours": llm_result.estimated_effort_hours,
-            "llm_reasoning": llm_result.reasoning,
-            "llm_confidence": llm_result.confidence,
-            "analysis_method": "llm",
-        }
+        return _llm_analysis(llm_result)
 
     except Exception as e:
         # Fallback to rule-based if LLM fails
@@ -166,47 +170,75 @@ Respond in valid JSON format:
     return prompt
 
 
+def _openai_request_body(prompt: str) -> dict:
+    """Chat completion request used for one analysis (also sent in batches)."""
+    return {
+        "model": LLM_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are an expert EU funding advisor providing structured analysis in JSON format.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": LLM_TEMPERATURE,
+        "max_tokens": 1500,
+    }
+
+
+def _parse_llm_response(content: str) -> LLMResponse:
+    """Parse the JSON answer of an analysis prompt."""
+    # Extract JSON from response (handle markdown code blocks)
+    fence = _JSON_FENCE_RE.search(content) or _FENCE_RE.search(content)
+    if fence:
+        content = fence.group(1)
+
+    data = _json_loads(content.strip())
+
+    return LLMResponse(
+        match_summary=data.get("match_summary", ""),
+        domain_matches=data.get("domain_matches", []),
+        keyword_hits=data.get("keyword_hits", []),
+        relevant_past_projects=data.get("relevant_past_projects", []),
+        suggested_partners=data.get("suggested_partners", []),
+        estimated_effort_hours=data.get("estimated_effort_hours", "80-150"),
+        reasoning=data.get("reasoning", ""),
+        confidence=data.get("confidence", "medium"),
+    )
+
+
+def _llm_analysis(llm_result: LLMResponse) -> dict:
+    """Convert an LLMResponse to the qualitative analysis format."""
+    return {
+        "match_summary": llm_result.match_summary,
+        "domain_matches": llm_result.domain_matches,
+        "keyword_hits": llm_result.keyword_hits,
+        "relevant_past_projects": llm_result.relevant_past_projects,
+        "suggested_partners": llm_result.suggested_partners,
+        "estimated_effort_hours": llm_result.estimated_effort_hours,
+        "llm_reasoning": llm_result.reasoning,
+        "llm_confidence": llm_result.confidence,
+        "analysis_method": "llm",
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _get_openai_client():
+    """Return the OpenAI client shared by all critic calls, so connections are reused."""
+    from openai import OpenAI
+
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+
 def call_openai(prompt: str, call_data: dict, company_profile: dict) -> LLMResponse:
     """Call OpenAI API for analysis"""
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = _get_openai_client()
 
-        response = client.chat.completions.create(
-            model=LLM_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert EU funding advisor providing structured analysis in JSON format.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=LLM_TEMPERATURE,
-            max_tokens=1500,
-        )
+        response = client.chat.completions.create(**_openai_request_body(prompt))
 
         # Parse JSON response
-        content = response.choices[0].message.content
-
-        # Extract JSON from response (handle markdown code blocks)
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
-
-        data = json.loads(content.strip())
-
-        return LLMResponse(
-            match_summary=data.get("match_summary", ""),
-            domain_matches=data.get("domain_matches", []),
-            keyword_hits=data.get("keyword_hits", []),
-            relevant_past_projects=data.get("relevant_past_projects", []),
-            suggested_partners=data.get("suggested_partners", []),
-            estimated_effort_hours=data.get("estimated_effort_hours", "80-150"),
-            reasoning=data.get("reasoning", ""),
-            confidence=data.get("confidence", "medium"),
-        )
+        return _parse_llm_response(response.choices[0].message.content)
 
     except ImportError:
         raise ImportError("OpenAI library not installed. Run: pip install openai")
@@ -230,26 +262,7 @@ def call_anthropic(prompt: str, call_data: dict, company_profile: dict) -> LLMRe
         )
 
         # Parse JSON response
-        content = response.content[0].text
-
-        # Extract JSON from response
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
-
-        data = json.loads(content.strip())
-
-        return LLMResponse(
-            match_summary=data.get("match_summary", ""),
-            domain_matches=data.get("domain_matches", []),
-            keyword_hits=data.get("keyword_hits", []),
-            relevant_past_projects=data.get("relevant_past_projects", []),
-            suggested_partners=data.get("suggested_partners", []),
-            estimated_effort_hours=data.get("estimated_effort_hours", "80-150"),
-            reasoning=data.get("reasoning", ""),
-            confidence=data.get("confidence", "medium"),
-        )
+        return _parse_llm_response(response.content[0].text)
 
     except ImportError:
         raise ImportError("Anthropic library not installed. Run: pip install anthropic")
@@ -257,6 +270,134 @@ def call_anthropic(prompt: str, call_data: dict, company_profile: dict) -> LLMRe
         raise Exception(f"Anthropic API error: {e}")
 
 
+# =============================================================================
+# BATCH API (offline runs)
+# =============================================================================
+
+
+def perform_qualitative_analysis_batch(
+    calls: List[dict], company_profile: dict, abort_event=None
+) -> Dict[str, dict]:
+    """
+    Qualitative analysis of many calls through the OpenAI Batch API.
+
+    All prompts are submitted as one batch job, which is cheaper per token
+    than individual requests but can take minutes to hours to finish, so this
+    is meant for scheduled scans rather than interactive runs. Polls every
+    LLM_BATCH_POLL_SECONDS (default 30) for at most LLM_BATCH_TIMEOUT_SECONDS
+    (default 86400). Calls without a batch result get the rule-based analysis.
+    Calls without an id are skipped; the caller analyzes them one by one.
+
+    Args:
+        calls: Calls to analyze
+        company_profile: Company profile the calls are matched against
+        abort_event: Optional threading.Event; once set, the batch job is
+            cancelled and every call gets the rule-based analysis
+
+    Returns:
+        Analysis per call, keyed by call id
+    """
+    calls = [call for call in calls if call.get("id") is not None]
+
+    if LLM_PROVIDER != "openai" or not is_llm_configured():
+        return {
+            call["id"]: perform_qualitative_analysis(call, company_profile)
+            for call in calls
+        }
+
+    try:
+        answers = run_openai_batch(
+            [build_analysis_prompt(call, company_profile) for call in calls],
+            abort_event,
+        )
+        error = "No result in batch output"
+    except Exception as e:
+        print(f"[LLM Error] Batch failed: {e}. Falling back to rule-based analysis.")
+        answers = {}
+        error = str(e)
+
+    results = {}
+    for i, call in enumerate(calls):
+        try:
+            if i not in answers:
+                raise Exception(error)
+            results[call["id"]] = _llm_analysis(_parse_llm_response(answers[i]))
+        except Exception as e:
+            result = perform_rule_based_analysis(call, company_profile)
+            result["llm_error"] = str(e)
+            results[call["id"]] = result
+    return results
+
+
+def run_openai_batch(prompts: List[str], abort_event=None) -> Dict[int, str]:
+    """
+    Run chat completions for a list of prompts as one OpenAI batch job.
+
+    Args:
+        prompts: Prompts, identified in the batch by their index
+        abort_event: Optional threading.Event; the job is cancelled as soon
+            as it is set instead of being polled to completion
+
+    Returns:
+        Answer text per prompt index, for the requests that succeeded
+    """
+    import time
+
+    client = _get_openai_client()
+
+    lines = [
+        json.dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _openai_request_body(prompt),
+            }
+        )
+        for i, prompt in enumerate(prompts)
+    ]
+    batch_file = client.files.create(
+        file=("critic_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"[LLM] Submitted batch {batch.id} with {len(lines)} requests")
+
+    poll_seconds = float(os.getenv("LLM_BATCH_POLL_SECONDS", "30"))
+    deadline = time.monotonic() + float(os.getenv("LLM_BATCH_TIMEOUT_SECONDS", "86400"))
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        if time.monotonic() > deadline:
+            client.batches.cancel(batch.id)
+            raise TimeoutError(f"Batch {batch.id} did not finish in time")
+        if abort_event is None:
+            time.sleep(poll_seconds)
+        elif abort_event.wait(poll_seconds):
+            # Waiting on the event wakes the loop as soon as the client aborts
+            client.batches.cancel(batch.id)
+            raise Exception(f"Batch {batch.id} cancelled: aborted by client")
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise Exception(f"Batch {batch.id} ended with status {batch.status}")
+
+    answers = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = _json_loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            continue
+        answers[int(record["custom_id"])] = response["body"]["choices"][0][
+            "message"
+        ]["content"]
+    return answers
+
+
 # =============================================================================
 # RULE-BASED FALLBACK (Original Implementation)
 # =============================================================================
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+from datetime import datetime
 from typing import Optional
 
 
@@ -17,8 +19,34 @@ class ScoreQuality:
         self.reasons = reasons
 
 
+def precompute_profile(company_profile: dict) -> dict:
+    """Normalize the profile fields used by rule-based scoring.
+
+    The result depends only on the company profile, so when scoring many calls
+    for one company it can be computed once and passed to `score_call` as
+    `precomputed`.
+    """
+    return {
+        "domains": [
+            (
+                cd["name"].lower(),
+                [s.lower() for s in cd.get("sub_domains", [])],
+                cd.get("level", "basic"),
+            )
+            for cd in company_profile.get("domains", [])
+        ],
+        "keywords": [
+            (keyword.lower(), _expand_keyword(keyword))
+            for keyword in company_profile.get("keywords", {}).get("include", [])
+        ],
+    }
+
+
 def score_call(
-    call_data: dict, company_profile: dict, llm_insights: Optional[dict] = None
+    call_data: dict,
+    company_profile: dict,
+    llm_insights: Optional[dict] = None,
+    precomputed: Optional[dict] = None,
 ) -> dict:
     """Score a call based on 6 criteria with weighted scoring (1-10 scale).
 
@@ -34,6 +62,9 @@ def score_call(
     - Computes a data-quality indicator and applies a *small* penalty when the
       call content is too sparse (e.g., missing description/keywords/domains).
       This prevents inflated or misleading mid-scores caused by “unknown => neutral”.
+
+    `precomputed` is the output of `precompute_profile(company_profile)`; it is
+    computed here when not given.
     """
 
     use_llm = bool(llm_insights) and llm_insights.get("analysis_method") == "llm"
@@ -56,8 +87,10 @@ def score_call(
         scoring_method = "llm_enhanced"
     else:
         # Rule-based fallback (no LLM configured or LLM failed)
-        domain_score = _score_domain_match(call_data, company_profile)
-        keyword_score = _score_keyword_match(call_data, company_profile)
+        if precomputed is None:
+            precomputed = precompute_profile(company_profile)
+        domain_score = _score_domain_match(call_data, precomputed["domains"])
+        keyword_score = _score_keyword_match(call_data, precomputed["keywords"])
         strategic_score = _score_strategic_value(call_data, company_profile)
         scoring_method = "rule_based"
 
@@ -191,9 +224,12 @@ def _score_strategic_value_from_llm(
 # RULE-BASED SCORING FUNCTIONS (Fallback)
 
 
-def _score_domain_match(call_data: dict, company_profile: dict) -> float:
-    """Score based on domain overlap with expertise level and subdomain bonus."""
-    company_domains = company_profile.get("domains", [])
+def _score_domain_match(call_data: dict, company_domains: list) -> float:
+    """Score based on domain overlap with expertise level and subdomain bonus.
+
+    `company_domains` holds (name, sub_domains, level) with lowercased names,
+    as built by `precompute_profile`.
+    """
     call_domains = call_data.get("required_domains", [])
 
     if not company_domains or not call_domains:
@@ -201,11 +237,7 @@ def _score_domain_match(call_data: dict, company_profile: dict) -> float:
 
     matches = []
 
-    for cd in company_domains:
-        cd_name = cd["name"].lower()
-        cd_subs = [s.lower() for s in cd.get("sub_domains", [])]
-        cd_level = cd.get("level", "basic")
-
+    for cd_name, cd_subs, cd_level in company_domains:
         for rd in call_domains:
             rd_lower = rd.lower()
             match_score = 0
@@ -247,9 +279,12 @@ def _score_domain_match(call_data: dict, company_profile: dict) -> float:
     return min(10.0, round(avg_score, 1))
 
 
-def _score_keyword_match(call_data: dict, company_profile: dict) -> float:
-    """Score based on keyword matching between company and call."""
-    company_keywords = company_profile.get("keywords", {}).get("include", [])
+def _score_keyword_match(call_data: dict, company_keywords: list) -> float:
+    """Score based on keyword matching between company and call.
+
+    `company_keywords` holds (keyword, variations) with lowercased keywords,
+    as built by `precompute_profile`.
+    """
     call_text = ""
 
     # Build call text from various fields
@@ -266,14 +301,12 @@ def _score_keyword_match(call_data: dict, company_profile: dict) -> float:
     matches = 0
     total_keywords = len(company_keywords)
 
-    for keyword in company_keywords:
-        keyword_lower = keyword.lower()
+    for keyword_lower, variations in company_keywords:
         # Check exact match
         if keyword_lower in call_text_lower:
             matches += 1
         else:
             # Check expanded variations
-            variations = _expand_keyword(keyword_lower)
             if any(var in call_text_lower for var in variations):
                 matches += 0.8  # Slightly lower score for variation match
 
@@ -292,57 +325,57 @@ def _score_keyword_match(call_data: dict, company_profile: dict) -> float:
         return 3.0
 
 
+# Semantic equivalence map
+_KEYWORD_EQUIVALENTS = {
+    # AI variations
+    "ai": {
+        "ai",
+        "artificial intelligence",
+        "machine intelligence",
+        "cognitive computing",
+    },
+    "artificial intelligence": {
+        "ai",
+        "artificial intelligence",
+        "machine intelligence",
+    },
+    "machine learning": {
+        "machine learning",
+        "ml",
+        "deep learning",
+        "neural networks",
+        "predictive modeling",
+    },
+    "ml": {"machine learning", "ml", "deep learning"},
+    "deep learning": {"deep learning", "neural networks", "ml", "machine learning"},
+    "nlp": {
+        "nlp",
+        "natural language processing",
+        "text analysis",
+        "language understanding",
+        "computational linguistics",
+    },
+    "natural language processing": {
+        "nlp",
+        "natural language processing",
+        "text analysis",
+    },
+    "llm": {
+        "llm",
+        "large language model",
+        "foundation model",
+        "generative ai",
+        "gpt",
+    },
+    "large language model": {"llm", "large language model", "foundation model"},
+    "generative ai": {"generative ai", "gen ai", "ai generation"},
+}
+
+
 def _expand_keyword(keyword: str) -> set:
     """Get semantic equivalents and variations for a keyword."""
     keyword = keyword.lower().strip()
-
-    # Semantic equivalence map
-    equivalents = {
-        # AI variations
-        "ai": {
-            "ai",
-            "artificial intelligence",
-            "machine intelligence",
-            "cognitive computing",
-        },
-        "artificial intelligence": {
-            "ai",
-            "artificial intelligence",
-            "machine intelligence",
-        },
-        "machine learning": {
-            "machine learning",
-            "ml",
-            "deep learning",
-            "neural networks",
-            "predictive modeling",
-        },
-        "ml": {"machine learning", "ml", "deep learning"},
-        "deep learning": {"deep learning", "neural networks", "ml", "machine learning"},
-        "nlp": {
-            "nlp",
-            "natural language processing",
-            "text analysis",
-            "language understanding",
-            "computational linguistics",
-        },
-        "natural language processing": {
-            "nlp",
-            "natural language processing",
-            "text analysis",
-        },
-        "llm": {
-            "llm",
-            "large language model",
-            "foundation model",
-            "generative ai",
-            "gpt",
-        },
-        "large language model": {"llm", "large language model", "foundation model"},
-        "generative ai": {"generative ai", "gen ai", "ai generation"},
-    }
-
-    return equivalents.get(keyword, {keyword})
+    return _KEYWORD_EQUIVALENTS.get(keyword, {keyword})
 
 
 def _score_strategic_value(call_data: dict, company_profile: dict) -> float:
@@ -442,10 +475,29 @@ def _score_budget_feasibility(call_data: dict, company_profile: dict) -> float:
             return 6.0
 
 
+_DEADLINE_RE = re.compile(
+    r"(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})",
+    re.IGNORECASE,
+)
+
+_MONTHS = {
+    "january": 1,
+    "february": 2,
+    "march": 3,
+    "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "august": 8,
+    "september": 9,
+    "october": 10,
+    "november": 11,
+    "december": 12,
+}
+
+
 def _score_deadline_comfort(call_data: dict) -> float:
     """Score deadline comfort based on days remaining."""
-    from datetime import datetime
-
     general_info = call_data.get("general_info", {})
     dates = general_info.get("dates", {})
     deadline_str = dates.get("deadline", "")
@@ -454,36 +506,15 @@ def _score_deadline_comfort(call_data: dict) -> float:
         return 5.0  # Neutral if no deadline info
 
     # Parse deadline
-    import re
-
-    date_match = re.search(
-        r"(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})",
-        deadline_str,
-        re.IGNORECASE,
-    )
+    date_match = _DEADLINE_RE.search(deadline_str)
 
     if not date_match:
         return 5.0
 
-    months = {
-        "january": 1,
-        "february": 2,
-        "march": 3,
-        "april": 4,
-        "may": 5,
-        "june": 6,
-        "july": 7,
-        "august": 8,
-        "september": 9,
-        "october": 10,
-        "november": 11,
-        "december": 12,
-    }
-
     try:
         deadline_date = datetime(
             int(date_match.group(3)),
-            months[date_match.group(2).lower()],
+            _MONTHS[date_match.group(2).lower()],
             int(date_match.group(1)),
         )
         days_until = (deadline_date - datetime.now()).days
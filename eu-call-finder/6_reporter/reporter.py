@@ -6,9 +6,18 @@ Location: 6_reporter/reporter.py
 import os
 import sys
 import json
+import functools
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used when missing
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers are unchanged
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -19,6 +28,46 @@ OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 LLM_MODEL_REPORTER = os.getenv("LLM_MODEL_REPORTER", "gpt-4")
 
 
+@functools.lru_cache(maxsize=1)
+def _get_openai_client():
+    """Return the OpenAI client shared by all reporter calls, so connections are reused."""
+    from openai import OpenAI
+
+    return OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+
+
+def _save_debug_response(
+    content: str, company_summary: Dict[str, Any], analyzed_calls_count: int
+) -> None:
+    """Write the raw LLM response to reporter_debug_<timestamp>.json."""
+    now = datetime.now()
+    debug_info = {
+        "timestamp": now.isoformat(),
+        "company_name": company_summary.get("name"),
+        "llm_raw_response": content,
+        "analyzed_calls_count": analyzed_calls_count,
+    }
+    debug_file = f"reporter_debug_{now.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(debug_file, "wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(debug_info))
+        else:
+            f.write(json.dumps(debug_info, ensure_ascii=False).encode("utf-8"))
+    print(f"[REPORTER] Debug info saved to: {debug_file}")
+
+
+def call_description(call: dict) -> str:
+    """Full description of an analyzed call (content first, then raw_data)."""
+    return (call.get("content") or {}).get("description") or (
+        call.get("raw_data") or {}
+    ).get("description", "")
+
+
+def preview(text: str, limit: int) -> str:
+    """First `limit` characters of text, with an ellipsis if it was cut."""
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
 def is_llm_configured() -> bool:
     """Check if LLM API key is configured."""
     if LLM_PROVIDER == "openai":
@@ -98,9 +147,7 @@ def generate_project_summary(call: dict, company_summary: dict) -> dict:
 
     try:
         if LLM_PROVIDER == "openai":
-            from openai import OpenAI
-
-            client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+            client = _get_openai_client()
 
             response = client.chat.completions.create(
                 model=LLM_MODEL_REPORTER,
@@ -138,14 +185,14 @@ def generate_project_summary(call: dict, company_summary: dict) -> dict:
             )
 
             try:
-                summary = json.loads(cleaned_content)
+                summary = _json_loads(cleaned_content)
             except json.JSONDecodeError:
                 # Try to find JSON between curly braces
                 start = cleaned_content.find("{")
                 end = cleaned_content.rfind("}")
                 if start != -1 and end != -1 and end > start:
                     json_str = cleaned_content[start : end + 1]
-                    summary = json.loads(json_str)
+                    summary = _json_loads(json_str)
                 else:
                     raise ValueError("No JSON object found in response")
 
@@ -428,9 +475,7 @@ def generate_llm_report(analyzed_calls: list, company_input: dict) -> dict:
 
     # Call LLM
     if LLM_PROVIDER == "openai":
-        from openai import OpenAI
-
-        client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+        client = _get_openai_client()
 
         response = client.chat.completions.create(
             model=LLM_MODEL_REPORTER,
@@ -451,20 +496,8 @@ def generate_llm_report(analyzed_calls: list, company_input: dict) -> dict:
             return generate_fallback_report(analyzed_calls, company_input)
 
         # Save raw LLM response to file for debugging
-        debug_file = f"reporter_debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(debug_file, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "company_name": company_summary.get("name"),
-                    "llm_raw_response": content,
-                    "analyzed_calls_count": len(analyzed_calls),
-                },
-                f,
-                indent=2,
-                ensure_ascii=False,
-            )
-        print(f"[REPORTER] Debug info saved to: {debug_file}")
+        if os.getenv("SAVE_DEBUG_REPORT", "false").lower() == "true":
+            _save_debug_response(content, company_summary, len(analyzed_calls))
 
         # Parse JSON response - handle markdown code blocks and clean up
         cleaned_content = content.strip()
@@ -488,7 +521,7 @@ def generate_llm_report(analyzed_calls: list, company_input: dict) -> dict:
                 cleaned_content.replace("```json", "").replace("```", "").strip()
             )
 
-            llm_report = json.loads(cleaned_content)
+            llm_report = _json_loads(cleaned_content)
         except json.JSONDecodeError as e:
             print(f"[REPORTER] Failed to parse LLM response as JSON: {e}")
             print(f"[REPORTER] Attempting to extract JSON from response...")
@@ -500,7 +533,7 @@ def generate_llm_report(analyzed_calls: list, company_input: dict) -> dict:
                 end = cleaned_content.rfind("}")
                 if start != -1 and end != -1 and end > start:
                     json_str = cleaned_content[start : end + 1]
-                    llm_report = json.loads(json_str)
+                    llm_report = _json_loads(json_str)
                     print("[REPORTER] Successfully extracted JSON from response")
                 else:
                     raise ValueError("No JSON object found in response")
@@ -777,11 +810,9 @@ def build_funding_cards(
         if not short_summary and project_overview:
             short_summary = project_overview
         if not short_summary:
-            raw_desc = call.get("raw_data", {}).get("description", "")
+            raw_desc = call_description(call)
             if raw_desc:
-                short_summary = (
-                    raw_desc[:300] + "..." if len(raw_desc) > 300 else raw_desc
-                )
+                short_summary = preview(raw_desc, 300)
         if not short_summary:
             short_summary = f"{call.get('title', 'This project')} - Review full details to learn more about this opportunity."
 
@@ -906,10 +937,8 @@ def generate_fallback_report(analyzed_calls: list, company_input: dict) -> dict:
             priority = "low"
 
         # Generate a rule-based summary instead of using match_summary
-        description = call.get("raw_data", {}).get("description", "")
-        short_desc = (
-            description[:300] + "..." if len(description) > 300 else description
-        )
+        description = call_description(call)
+        short_desc = preview(description, 300)
 
         # Build why_recommended based on scores and eligibility without match_summary
         eligibility_passed = call.get("eligibility_passed", False)
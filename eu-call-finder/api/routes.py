@@ -88,10 +88,17 @@ router = APIRouter()
 
 
 def load_master_agent():
-    """Load the master_agent module using importlib."""
+    """
+    Load the master_agent module using importlib.
+    The loaded module is reused, so its compiled workflow is shared by requests.
+    """
     base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     module_path = os.path.join(base_path, "2_orchestration", "master_agent.py")
 
+    module = sys.modules.get("master_agent")
+    if module is not None and getattr(module, "__file__", None) == module_path:
+        return module
+
     if not os.path.exists(module_path):
         raise FileNotFoundError(f"Master agent module not found at {module_path}")
 
@@ -100,7 +107,12 @@ def load_master_agent():
         raise ImportError(f"Failed to load module spec from {module_path}")
 
     module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    sys.modules["master_agent"] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop("master_agent", None)
+        raise
     return module
 
 
@@ -0,0 +1,106 @@
+"""
+Response cache for the parsed LLM replies of the Safety Guard and the Input
+Validator. Replies are stored as plain dicts under string keys with a TTL,
+in memory by default or in Redis when REDIS_URL is set.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    import redis
+except ImportError:  # Optional: only needed when REDIS_URL is set
+    redis = None
+
+DEFAULT_TTL_SECONDS = 3600
+
+# In-memory entries beyond this are evicted, soonest-expiring first
+DEFAULT_MAX_ENTRIES = 2048
+
+
+class LLMCache:
+    """TTL cache of JSON-serializable results keyed by string."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        redis_url: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long entries stay valid
+            redis_url: Redis connection URL. Uses an in-memory dict if None.
+            max_entries: Maximum in-memory entries
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple] = {}
+        self._redis = redis.Redis.from_url(redis_url) if redis_url else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None if missing or expired."""
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(key)
+            except Exception as e:
+                print(f"[CACHE] Redis get failed: {e}")
+                return None
+            return json.loads(raw) if raw else None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store value under key for ttl_seconds."""
+        if self._redis is not None:
+            try:
+                self._redis.setex(key, self.ttl_seconds, json.dumps(value, default=str))
+            except Exception as e:
+                print(f"[CACHE] Redis set failed: {e}")
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            if len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """
+    Return the shared cache, configured from environment variables.
+
+    LLM_CACHE_TTL sets the TTL in seconds (default 3600). REDIS_URL switches
+    to a Redis backend if the redis package is installed.
+    """
+    global _llm_cache
+
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            redis_url = os.getenv("REDIS_URL")
+            if redis_url and redis is None:
+                print("[CACHE] REDIS_URL is set but redis is not installed; using memory")
+                redis_url = None
+            _llm_cache = LLMCache(
+                ttl_seconds=int(os.getenv("LLM_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+                redis_url=redis_url,
+            )
+        return _llm_cache
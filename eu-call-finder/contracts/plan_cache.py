@@ -0,0 +1,309 @@
+"""
+Plan cache for the EU Call Finder planner.
+Stores scraper plans keyed by company profile so repeated (or very similar)
+profiles can skip the planning LLM call.
+
+Exact hits are looked up by a hash of the profile, first in memory and then
+in SQLite. Optionally, near-duplicate profiles are matched by the cosine
+similarity of an embedding of the description and domains. Plans expire
+after a TTL, so stored profiles are re-planned periodically.
+"""
+
+import os
+import copy
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import contextlib
+import functools
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Minimum cosine similarity for a semantic (non-exact) hit
+DEFAULT_SIMILARITY_THRESHOLD = 0.90
+
+# Stored plans beyond this are evicted, oldest first
+DEFAULT_MAX_ENTRIES = 500
+
+# Plans older than this are re-planned (7 days)
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+class PlanCache:
+    """
+    Cache of planner output keyed by company profile.
+
+    Plans are kept in an in-memory dict backed by a SQLite table, so they
+    survive restarts. If an embedding function is given, profiles without an
+    exact hit are compared against the stored profile embeddings.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the plan cache.
+
+        Args:
+            db_path: SQLite database file for persisted plans
+            embed_fn: Optional function returning an embedding for a text.
+                Enables semantic hits when set.
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_entries: Maximum number of stored plans
+            ttl_seconds: How long a stored plan stays valid
+        """
+        self.db_path = db_path
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._plans: Dict[str, Dict[str, Any]] = {}
+        self._embeddings: Dict[str, List[float]] = {}
+        # Unix time each plan was stored at, for the TTL
+        self._created: Dict[str, float] = {}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS plan_cache (
+                    key TEXT PRIMARY KEY,
+                    plan TEXT NOT NULL,
+                    embedding TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            for key, plan, embedding, created in conn.execute(
+                "SELECT key, plan, embedding, strftime('%s', created_at) "
+                "FROM plan_cache"
+            ):
+                self._plans[key] = json.loads(plan)
+                self._created[key] = float(created or 0)
+                if embedding:
+                    self._embeddings[key] = json.loads(embedding)
+
+    def get(self, company_input: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached plan for a company profile.
+
+        Args:
+            company_input: Company input as a dict
+
+        Returns:
+            A copy of the cached plan with a fresh timestamp, or None on a miss
+        """
+        key = profile_key(company_input)
+        with self._lock:
+            plan = self._live_plan(key)
+        if plan is not None:
+            return {**copy.deepcopy(plan), "timestamp": datetime.now().isoformat()}
+
+        if self.embed_fn is None:
+            return None
+
+        return self._semantic_get(company_input)
+
+    def put(self, company_input: Dict[str, Any], plan: Dict[str, Any]) -> None:
+        """
+        Store the plan created for a company profile.
+
+        Args:
+            company_input: Company input as a dict
+            plan: Plan returned by the planner
+        """
+        key = profile_key(company_input)
+        embedding = None
+        if self.embed_fn is not None:
+            try:
+                embedding = self.embed_fn(_profile_text(company_input))
+            except Exception as e:
+                print(f"[PLAN CACHE] Embedding failed, storing exact key only: {e}")
+
+        with self._lock:
+            # Stored as a copy, so later edits by the caller don't leak in
+            self._plans[key] = copy.deepcopy(plan)
+            self._created[key] = time.time()
+            if embedding:
+                self._embeddings[key] = embedding
+
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO plan_cache (key, plan, embedding) VALUES (?, ?, ?)",
+                    (
+                        key,
+                        json.dumps(plan, default=str),
+                        json.dumps(embedding) if embedding else None,
+                    ),
+                )
+                evicted = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT key FROM plan_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+                        (self.max_entries,),
+                    )
+                ]
+                for old_key in evicted:
+                    conn.execute("DELETE FROM plan_cache WHERE key = ?", (old_key,))
+                    self._forget(old_key)
+
+    def _semantic_get(self, company_input: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the plan of the most similar stored profile above the threshold."""
+        with self._lock:
+            now = time.time()
+            stored = [
+                (key, embedding)
+                for key, embedding in self._embeddings.items()
+                if now - self._created.get(key, 0) < self.ttl_seconds
+            ]
+        if not stored:
+            return None
+
+        try:
+            query = self.embed_fn(_profile_text(company_input))
+        except Exception as e:
+            print(f"[PLAN CACHE] Embedding failed, skipping semantic lookup: {e}")
+            return None
+
+        best_key, best_score = None, self.similarity_threshold
+        for key, embedding in stored:
+            score = _cosine_similarity(query, embedding)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+
+        with self._lock:
+            plan = self._live_plan(best_key)
+        if plan is None:
+            return None
+
+        # The plan was made for another company; keep its queries but not its name
+        company = company_input.get("company", {})
+        return {
+            **copy.deepcopy(plan),
+            "company_name": company.get("name", plan.get("company_name")),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def _live_plan(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored plan for key, dropping it if expired. Needs the lock."""
+        plan = self._plans.get(key)
+        if plan is None:
+            return None
+        if time.time() - self._created.get(key, 0) < self.ttl_seconds:
+            return plan
+
+        self._forget(key)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM plan_cache WHERE key = ?", (key,))
+        return None
+
+    def _forget(self, key: str) -> None:
+        """Drop a plan from memory. Needs the lock."""
+        self._plans.pop(key, None)
+        self._embeddings.pop(key, None)
+        self._created.pop(key, None)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        with contextlib.closing(sqlite3.connect(self.db_path)) as conn, conn:
+            yield conn
+
+
+def profile_key(company_input: Dict[str, Any]) -> str:
+    """Stable hash of a company input dict."""
+    payload = json.dumps(company_input, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _profile_text(company_input: Dict[str, Any]) -> str:
+    """Text used for the profile embedding: description and domains."""
+    company = company_input.get("company", {})
+    domains = []
+    for domain in company.get("domains", []):
+        domains.append(domain.get("name", ""))
+        domains.extend(domain.get("sub_domains") or [])
+    return f"{company.get('description', '')}\nDomains: {', '.join(domains)}"
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+@functools.lru_cache(maxsize=1)
+def _get_embedding_client():
+    """Return the OpenAI client used for embeddings, created on first use."""
+    import openai
+
+    return openai.OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+    )
+
+
+def _openai_embedding(text: str) -> List[float]:
+    """Embed text with the configured OpenAI-compatible endpoint."""
+    response = _get_embedding_client().embeddings.create(
+        model=os.getenv("PLAN_CACHE_EMBEDDING_MODEL", "text-embedding-3-small"),
+        input=text,
+    )
+    return response.data[0].embedding
+
+
+_plan_cache: Optional[PlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> Optional[PlanCache]:
+    """
+    Return the shared plan cache, configured from environment variables.
+
+    PLAN_CACHE_ENABLED (default false) turns the cache on or off,
+    PLAN_CACHE_PATH sets the SQLite file, PLAN_CACHE_TTL the plan lifetime in
+    seconds, and PLAN_CACHE_SEMANTIC=true enables embedding-based hits
+    (needs OPENAI_API_KEY).
+
+    Returns:
+        The PlanCache, or None if caching is disabled
+    """
+    global _plan_cache
+
+    if os.getenv("PLAN_CACHE_ENABLED", "false").lower() != "true":
+        return None
+
+    with _plan_cache_lock:
+        if _plan_cache is None:
+            semantic = (
+                os.getenv("PLAN_CACHE_SEMANTIC", "false").lower() == "true"
+                and os.getenv("OPENAI_API_KEY")
+            )
+            _plan_cache = PlanCache(
+                db_path=os.getenv("PLAN_CACHE_PATH", "data/plan_cache.db"),
+                embed_fn=_openai_embedding if semantic else None,
+                similarity_threshold=float(
+                    os.getenv(
+                        "PLAN_CACHE_SIMILARITY", str(DEFAULT_SIMILARITY_THRESHOLD)
+                    )
+                ),
+                ttl_seconds=int(
+                    os.getenv("PLAN_CACHE_TTL", str(DEFAULT_TTL_SECONDS))
+                ),
+            )
+        return _plan_cache
@@ -35,6 +35,8 @@ class WorkflowState(TypedDict):
     scraper_plan: Optional[Dict[str, Any]]  # Current plan
     plan_approved: bool  # Whether critic approved the plan
     plan_feedback: Optional[str]  # Critic feedback for plan refinement
+    last_plan_hash: Optional[str]  # Fingerprint of the current plan's searches
+    prev_plan_hash: Optional[str]  # Same for the previous iteration's plan
 
     # === RETRIEVAL ===
     search_terms: List[str]
@@ -47,6 +49,7 @@ class WorkflowState(TypedDict):
     eligibility_results: List[Dict[str, Any]]
     analysis_errors: List[str]
     analysis_summary: Optional[Dict[str, Any]]  # Reflection results and decision
+    batch_mode: bool  # Send LLM critic calls as one Batch API job (offline runs)
 
     # === REPORTING ===
     final_report: Optional[Dict[str, Any]]
@@ -99,7 +102,9 @@ class CompanyProfile:
     keywords: List[str] = field(default_factory=list)
 
 
-def create_initial_state(company_input: Dict[str, Any]) -> WorkflowState:
+def create_initial_state(
+    company_input: Dict[str, Any], batch_mode: bool = False
+) -> WorkflowState:
     """Create initial workflow state from company input."""
     return {
         "company_input": company_input,
@@ -111,6 +116,8 @@ def create_initial_state(company_input: Dict[str, Any]) -> WorkflowState:
         "scraper_plan": None,
         "plan_approved": False,
         "plan_feedback": None,
+        "last_plan_hash": None,
+        "prev_plan_hash": None,
         "search_terms": [],
         "search_query": {},
         "scraped_topics": [],
@@ -119,6 +126,7 @@ def create_initial_state(company_input: Dict[str, Any]) -> WorkflowState:
         "eligibility_results": [],
         "analysis_errors": [],
         "analysis_summary": None,
+        "batch_mode": batch_mode,
         "final_report": None,
         "report_format": "json",
         "current_step": "safety_check",
@@ -0,0 +1,108 @@
+"""
+Shared fixtures: a fake streaming OpenAI client for the safety modules.
+"""
+
+import importlib
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from contracts.llm_cache import LLMCache
+
+_ROW = re.compile(r"=== ROW (\d+) ===")
+
+
+class FakeStream:
+    """Streamed JSON-mode completion, a few characters per chunk."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.closed = False
+
+    def __iter__(self):
+        for i in range(0, len(self.content), 7):
+            delta = SimpleNamespace(content=self.content[i : i + 7])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeOpenAI:
+    """
+    Records chat.completions.create calls and answers them with reply(messages),
+    which returns the JSON content (dict or raw string) of the completion.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.reply = lambda messages: {}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = self.reply(kwargs["messages"])
+        if not isinstance(content, str):
+            content = json.dumps(content)
+        return FakeStream(content)
+
+    @staticmethod
+    def rows(messages):
+        """Row ids listed in a batched prompt."""
+        return [int(row_id) for row_id in _ROW.findall(messages[-1]["content"])]
+
+
+class FakeAsyncStream(FakeStream):
+    """Async variant of FakeStream."""
+
+    async def __aiter__(self):
+        for chunk in FakeStream.__iter__(self):
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncOpenAI:
+    """AsyncOpenAI stand-in that answers from a FakeOpenAI and records closing."""
+
+    def __init__(self, sync_client: FakeOpenAI):
+        self.sync_client = sync_client
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        stream = self.sync_client._create(**kwargs)
+        return FakeAsyncStream(stream.content)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """
+    Route the validator and guard LLM calls to a FakeOpenAI, with an empty
+    cache. Async clients handed out are kept in client.async_clients.
+    """
+    client = FakeOpenAI()
+    client.async_clients = []
+
+    def async_client(*args):
+        async_client = FakeAsyncOpenAI(client)
+        client.async_clients.append(async_client)
+        return async_client
+
+    monkeypatch.setattr(
+        importlib.import_module("contracts.llm_cache"), "_llm_cache", LLMCache()
+    )
+    for name in ("1_safety.input_validator", "1_safety.safety_guard"):
+        module = importlib.import_module(name)
+        monkeypatch.setattr(module, "get_client", lambda *args: client)
+        monkeypatch.setattr(module, "async_client", async_client)
+    return client
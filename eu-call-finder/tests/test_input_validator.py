@@ -0,0 +1,128 @@
+"""
+Tests for InputValidator, with the LLM replaced by a fake streaming client.
+"""
+
+import importlib
+import json
+
+from contracts.schemas import CompanyInput, CompanyProfile, Domain, DomainLevel
+
+input_validator = importlib.import_module("1_safety.input_validator")
+InputValidator = input_validator.InputValidator
+
+_DESCRIPTION = (
+    "{name} builds autonomous warehouse robots with computer vision and "
+    "reinforcement learning for logistics companies across Europe."
+)
+
+
+def _company_input(name: str, description: str = None) -> CompanyInput:
+    return CompanyInput(
+        company=CompanyProfile(
+            name=name,
+            type="SME",
+            employees=20,
+            country="Germany",
+            description=description or _DESCRIPTION.format(name=name),
+            domains=[
+                Domain(
+                    name="Robotics",
+                    sub_domains=["Computer Vision"],
+                    level=DomainLevel.EXPERT,
+                )
+            ],
+        )
+    )
+
+
+def _row(row_id: int, score: float = 8) -> dict:
+    return {
+        "row_id": row_id,
+        "is_valid": True,
+        "score": score,
+        "missing_fields": [],
+        "reason": f"row {row_id}",
+    }
+
+
+def test_validate_many_sends_one_call_per_batch(fake_openai):
+    fake_openai.reply = lambda messages: {
+        "results": [_row(row_id) for row_id in fake_openai.rows(messages)]
+    }
+    validator = InputValidator(openai_api_key="test", model="gpt-4o")
+    inputs = [_company_input(f"Company {i}") for i in range(20)]
+
+    results = validator.validate_many(inputs)
+
+    # 16 rows per call for larger models
+    assert [len(fake_openai.rows(call["messages"])) for call in fake_openai.calls] == [16, 4]
+    assert len(results) == 20
+    assert all(result.is_valid for result in results)
+    assert results[17].reason == "LLM Analysis: row 2"
+
+
+def test_validate_many_skips_inputs_rejected_before_the_llm(fake_openai):
+    fake_openai.reply = lambda messages: {
+        "results": [_row(row_id) for row_id in fake_openai.rows(messages)]
+    }
+    validator = InputValidator(openai_api_key="test")
+    inputs = [
+        _company_input("Good Co"),
+        _company_input("Weak Co", description="robots robots robots robots"),
+        _company_input("Other Co"),
+    ]
+
+    results = validator.validate_many(inputs)
+
+    assert len(fake_openai.calls) == 1
+    assert fake_openai.rows(fake_openai.calls[0]["messages"]) == [1, 2]
+    assert [result.is_valid for result in results] == [True, False, True]
+
+
+def test_validate_many_shares_the_cache_with_validate(fake_openai):
+    fake_openai.reply = lambda messages: (
+        {"results": [_row(row_id) for row_id in fake_openai.rows(messages)]}
+        if fake_openai.rows(messages)
+        else _row(1, score=6)
+    )
+    validator = InputValidator(openai_api_key="test")
+    single = _company_input("Single Co")
+    assert validator.validate(single).score == 6
+    assert len(fake_openai.calls) == 1
+
+    results = validator.validate_many([single, _company_input("Batch Co")])
+
+    # Only the uncached input goes into the batch prompt
+    assert len(fake_openai.calls) == 2
+    assert fake_openai.rows(fake_openai.calls[1]["messages"]) == [1]
+    assert results[0].score == 6
+    validator.validate(_company_input("Batch Co"))
+    assert len(fake_openai.calls) == 2
+
+
+def test_validate_many_does_not_cache_unparsed_rows(fake_openai):
+    # The model skips row 2
+    fake_openai.reply = lambda messages: {"results": [_row(1)]}
+    validator = InputValidator(openai_api_key="test")
+    inputs = [_company_input("First Co"), _company_input("Second Co")]
+
+    results = validator.validate_many(inputs)
+    assert "Using fallback validation" in results[1].reason
+
+    validator.validate_many(inputs)
+    assert fake_openai.rows(fake_openai.calls[1]["messages"]) == [1]
+
+
+def test_validate_caches_the_parsed_reply_as_json(fake_openai):
+    llm_cache = importlib.import_module("contracts.llm_cache").get_llm_cache()
+    fake_openai.reply = lambda messages: _row(1, score=7)
+    input_data = _company_input("Cached Co")
+
+    first = InputValidator(openai_api_key="test").validate(input_data)
+    second = InputValidator(openai_api_key="test").validate(input_data)
+
+    assert len(fake_openai.calls) == 1
+    assert first == second
+    # Plain JSON, so the Redis backend can hold it too
+    (_, reply), = llm_cache._entries.values()
+    assert json.loads(json.dumps(reply))["score"] == 7
@@ -0,0 +1,167 @@
+"""
+Tests for the master agent's per-topic analysis, with the pipeline steps
+replaced by fakes.
+"""
+
+import asyncio
+import importlib
+import operator
+import threading
+from typing import Annotated, Any, TypedDict
+
+import pytest
+
+master_agent = importlib.import_module("2_orchestration.master_agent")
+
+_TOPIC = {"id": "HORIZON-1", "title": "Robots for warehouses"}
+
+
+def _scoring(topic, company_profile, qualitative, precomputed=None):
+    return {
+        **dict.fromkeys(master_agent._SCORE_BREAKDOWN_FIELDS, 7.0),
+        "total": 7.0,
+        "recommendation": {"action": "apply", "label": "OK", "color": "green"},
+    }
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    """Fake eligibility, critic and scorer steps; the dict can be edited per test."""
+    resolved = {
+        "apply_eligibility_filters": lambda topic, profile: {"all_passed": False},
+        "perform_qualitative_analysis": lambda topic, profile: {
+            "match_summary": "llm",
+            "analysis_method": "llm",
+        },
+        "perform_rule_based_analysis": lambda topic, profile: {
+            "match_summary": "rules",
+            "analysis_method": "rule_based",
+        },
+        "score_call": _scoring,
+    }
+    monkeypatch.setattr(master_agent, "_resolved", resolved)
+    monkeypatch.setenv("QUIET", "true")
+    return resolved
+
+
+def test_ineligible_topics_get_the_rule_based_analysis(steps, monkeypatch):
+    monkeypatch.setenv("CRITIC_SKIP_INELIGIBLE", "true")
+
+    result = asyncio.run(master_agent._analyze_topic(_TOPIC, {}, "[1/1]"))
+
+    assert result["analysis_method"] == "rule_based"
+    assert result["eligibility_passed"] is False
+
+
+def test_eligibility_overlaps_the_critic_when_not_skipping(steps, monkeypatch):
+    monkeypatch.setenv("CRITIC_SKIP_INELIGIBLE", "false")
+    critic_started = threading.Event()
+
+    def eligibility(topic, profile):
+        # Only returns in time if the critic call is already running
+        return {"all_passed": critic_started.wait(timeout=5)}
+
+    def critic(topic, profile):
+        critic_started.set()
+        return {"match_summary": "llm", "analysis_method": "llm"}
+
+    steps["apply_eligibility_filters"] = eligibility
+    steps["perform_qualitative_analysis"] = critic
+
+    result = asyncio.run(master_agent._analyze_topic(_TOPIC, {}, "[1/1]"))
+
+    assert result["eligibility_passed"] is True
+    assert result["analysis_method"] == "llm"
+
+
+class _CounterState(TypedDict):
+    visits: Annotated[list, operator.add]
+
+
+def _counter_app(checkpointer):
+    from langgraph.graph import END, StateGraph
+
+    graph = StateGraph(_CounterState)
+    graph.add_node("visit", lambda state: {"visits": [len(state["visits"])]})
+    graph.set_entry_point("visit")
+    graph.add_edge("visit", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+@pytest.mark.parametrize("db", [False, True])
+def test_a_thread_resumes_from_its_checkpoint(tmp_path, monkeypatch, db):
+    if db:
+        monkeypatch.setenv("CHECKPOINT_DB", str(tmp_path / "checkpoints.db"))
+    else:
+        monkeypatch.delenv("CHECKPOINT_DB", raising=False)
+    app = _counter_app(master_agent._default_checkpointer())
+    config = {"configurable": {"thread_id": "acme"}}
+
+    app.invoke({"visits": []}, config)
+    second = app.invoke({"visits": []}, config)
+
+    # The second run starts from the state the first one left
+    assert second["visits"] == [0, 1]
+    assert app.get_state(config).values["visits"] == [0, 1]
+    assert not app.get_state({"configurable": {"thread_id": "other"}}).values["visits"]
+
+
+def test_runs_without_a_thread_are_not_checkpointed():
+    assert master_agent.get_compiled_app(checkpointed=False).checkpointer is None
+
+
+class _StepState(TypedDict):
+    steps: Annotated[list, operator.add]
+    workflow_status: str
+    abort_event: Any
+
+
+def _two_step_app():
+    from langgraph.graph import END, StateGraph
+
+    graph = StateGraph(_StepState)
+    graph.add_node("planner", lambda state: {"steps": ["planner"]})
+    graph.add_node(
+        "reporter", lambda state: {"steps": ["reporter"], "workflow_status": "completed"}
+    )
+    graph.set_entry_point("planner")
+    graph.add_edge("planner", "reporter")
+    graph.add_edge("reporter", END)
+    return graph.compile()
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Updates passed to _render_update, as (node, update) pairs."""
+    updates = []
+    monkeypatch.setattr(
+        master_agent, "_render_update", lambda node, update: updates.append((node, update))
+    )
+    monkeypatch.setenv("QUIET", "false")
+    return updates
+
+
+def test_run_stream_renders_updates_and_returns_the_final_state(rendered, capsys):
+    abort_event = threading.Event()
+    state = {"steps": [], "workflow_status": "running", "abort_event": abort_event}
+
+    result = master_agent._run_stream(_two_step_app(), state, {}, abort_event)
+
+    assert rendered == [
+        ("planner", {"steps": ["planner"]}),
+        ("reporter", {"steps": ["reporter"], "workflow_status": "completed"}),
+    ]
+    assert result == {"steps": ["planner", "reporter"], "workflow_status": "completed"}
+    assert "Status: completed" in capsys.readouterr().out
+
+
+def test_run_stream_stops_when_aborted(rendered):
+    abort_event = threading.Event()
+    abort_event.set()
+    state = {"steps": [], "workflow_status": "running", "abort_event": abort_event}
+
+    result = master_agent._run_stream(_two_step_app(), state, {}, abort_event)
+
+    assert [node for node, _ in rendered] == ["planner"]
+    assert result["workflow_status"] == "failed"
+    assert result["error_message"] == "Workflow aborted by client"
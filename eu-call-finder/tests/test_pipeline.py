@@ -0,0 +1,46 @@
+"""
+Tests for the combined async validation + safety entry point.
+"""
+
+import asyncio
+import importlib
+
+from contracts.schemas import CompanyInput, CompanyProfile, Domain, DomainLevel
+
+safety = importlib.import_module("1_safety")
+
+
+def _company_input() -> CompanyInput:
+    return CompanyInput(
+        company=CompanyProfile(
+            name="Acme Corp",
+            type="SME",
+            employees=10,
+            country="Bulgaria",
+            description="We build AI for healthcare diagnostics using computer "
+            "vision and deep learning pipelines.",
+            domains=[Domain(name="AI", sub_domains=["ML"], level=DomainLevel.ADVANCED)],
+        )
+    )
+
+
+def _reply(messages):
+    if "security" in messages[0]["content"]:
+        return {"is_safe": True, "threat_detected": False, "confidence": 0.1}
+    return {"is_valid": True, "score": 8, "missing_fields": [], "reason": "ok"}
+
+
+def test_validate_and_guard_closes_its_clients(fake_openai):
+    fake_openai.reply = _reply
+
+    # One event loop per run, as in the workflow nodes
+    for _ in range(2):
+        validation, safety_result = asyncio.run(
+            safety.validate_and_guard(_company_input(), openai_api_key="test")
+        )
+        assert validation.is_valid and safety_result.is_valid
+
+    # The second run is answered from the cache
+    assert len(fake_openai.calls) == 2
+    assert len(fake_openai.async_clients) == 2
+    assert all(client.closed for client in fake_openai.async_clients)
@@ -0,0 +1,66 @@
+"""
+Tests for the SQLite-backed plan cache.
+"""
+
+import sqlite3
+
+import pytest
+
+from contracts import plan_cache
+from contracts.plan_cache import PlanCache
+
+_INPUT = {"company": {"name": "Acme", "description": "Warehouse robots"}}
+_PLAN = {
+    "company_name": "Acme",
+    "search_queries": [{"query": "robotics", "filters": {"status": ["open"]}}],
+    "llm_generated": True,
+}
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Record every SQLite connection the cache opens."""
+    opened = []
+    connect = sqlite3.connect
+
+    def recording_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(plan_cache.sqlite3, "connect", recording_connect)
+    return opened
+
+
+def test_plans_survive_a_restart(tmp_path):
+    db_path = str(tmp_path / "plans.db")
+    PlanCache(db_path).put(_INPUT, _PLAN)
+
+    plan = PlanCache(db_path).get(_INPUT)
+
+    assert plan["search_queries"] == _PLAN["search_queries"]
+    assert "timestamp" in plan
+
+
+def test_hits_are_copies(tmp_path):
+    cache = PlanCache(str(tmp_path / "plans.db"))
+    plan = {**_PLAN, "search_queries": [dict(_PLAN["search_queries"][0])]}
+    cache.put(_INPUT, plan)
+    plan["search_queries"].append({"query": "added after put"})
+
+    first = cache.get(_INPUT)
+    first["search_queries"][0]["filters"]["status"].append("closed")
+
+    assert cache.get(_INPUT)["search_queries"] == _PLAN["search_queries"]
+
+
+def test_connections_are_closed(tmp_path, connections):
+    cache = PlanCache(str(tmp_path / "plans.db"), ttl_seconds=0)
+    cache.put(_INPUT, _PLAN)
+    # Expired, so the lookup deletes the row
+    assert cache.get(_INPUT) is None
+
+    assert len(connections) == 3
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
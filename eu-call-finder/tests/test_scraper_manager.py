@@ -0,0 +1,131 @@
+"""
+Tests for the scraper's search fan-out, with the search API and the
+browsers replaced by fakes.
+"""
+
+import importlib
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+scraper_manager = importlib.import_module("4_retrieval.scraper_manager")
+
+# Topic ids the fake search API finds for each term
+_RESULTS = {
+    "robotics": ["T1", "T2", "T3"],
+    "ai": ["T2", "T4"],
+    "manufacturing": ["T3", "T5"],
+}
+
+
+class FakeResponse:
+    def __init__(self, term: str):
+        self.term = term
+
+    def raise_for_status(self):
+        if self.term not in _RESULTS:
+            raise requests.HTTPError(f"500 for {self.term}")
+
+    def json(self):
+        return {
+            "results": [
+                {"metadata": {"identifier": [topic_id], "title": [f"Topic {topic_id}"]}}
+                for topic_id in _RESULTS[self.term]
+            ]
+        }
+
+
+class FakeDriver:
+    def __init__(self):
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    """Record searched terms, started browsers and scraped topic ids."""
+    recorded = SimpleNamespace(terms=[], drivers=[], scraped=[])
+    lock = threading.Lock()
+
+    def post(url, params, **kwargs):
+        with lock:
+            recorded.terms.append(params["text"])
+        return FakeResponse(params["text"])
+
+    def make_driver(headless):
+        driver = FakeDriver()
+        with lock:
+            recorded.drivers.append(driver)
+        return driver
+
+    def scrape_topic(driver, item):
+        with lock:
+            recorded.scraped.append(item["identifier"])
+        return {"id": item["identifier"], "title": item["title"]}
+
+    monkeypatch.setattr(scraper_manager.requests, "post", post)
+    monkeypatch.setattr(scraper_manager, "_make_driver", make_driver)
+    monkeypatch.setattr(scraper_manager, "_scrape_topic", scrape_topic)
+    monkeypatch.setenv("SCRAPER_CONCURRENCY", "2")
+    return recorded
+
+
+def test_topics_found_by_several_terms_are_scraped_once(scraper):
+    topics = scraper_manager.scrape_topics_to_json(
+        search_terms=["robotics", "ai", "manufacturing"]
+    )
+
+    assert sorted(scraper.terms) == ["ai", "manufacturing", "robotics"]
+    assert [topic["id"] for topic in topics] == ["T1", "T2", "T3", "T4", "T5"]
+    assert sorted(scraper.scraped) == ["T1", "T2", "T3", "T4", "T5"]
+    # One small browser pool for all terms, closed at the end
+    assert len(scraper.drivers) == 2
+    assert all(driver.closed for driver in scraper.drivers)
+
+
+def test_max_topics_applies_to_the_merged_topics(scraper):
+    topics = scraper_manager.scrape_topics_to_json(
+        search_terms=["ai", "robotics"], max_topics=3
+    )
+
+    assert [topic["id"] for topic in topics] == ["T2", "T4", "T1"]
+    assert sorted(scraper.scraped) == ["T1", "T2", "T4"]
+
+
+def test_a_failed_search_term_is_skipped(scraper):
+    topics = scraper_manager.scrape_topics_to_json(search_terms=["broken", "ai"])
+
+    assert [topic["id"] for topic in topics] == ["T2", "T4"]
+
+
+def test_retrieval_fails_when_every_search_term_fails(scraper):
+    with pytest.raises(requests.HTTPError):
+        scraper_manager.scrape_topics_to_json(search_terms=["broken", "down"])
+    assert scraper.drivers == []
+
+
+def test_no_browser_is_started_without_topics(scraper):
+    assert scraper_manager.scrape_topics_to_json(search_terms=["ai"], max_topics=0) == []
+    assert scraper.drivers == []
+
+
+def test_scraping_stops_after_an_error(scraper, monkeypatch):
+    monkeypatch.setenv("SCRAPER_CONCURRENCY", "1")
+    scrape_topic = scraper_manager._scrape_topic
+
+    def failing_scrape_topic(driver, item):
+        if item["identifier"] == "T2":
+            raise RuntimeError("page did not load")
+        return scrape_topic(driver, item)
+
+    monkeypatch.setattr(scraper_manager, "_scrape_topic", failing_scrape_topic)
+
+    topics = scraper_manager.scrape_topics_to_json(search_terms=["robotics"])
+
+    # The topics scraped before the error are kept
+    assert [topic["id"] for topic in topics] == ["T1"]
+    assert all(driver.closed for driver in scraper.drivers)